@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from settings import *
+
+
+class AssetManager:
+    """画像アセットの一括管理（デコードはワーカースレッド、convertはメインスレッド）"""
+    def __init__(self, img_dir=None):
+        self.img_dir = img_dir or os.path.join(os.path.dirname(__file__), "assets", "img")
+        self.pending = {}   # 名前 -> デコード中のFuture
+        self.surfaces = {}  # 名前 -> convert済みのSurface
+        self.scaled = {}    # (名前, サイズ) -> 拡大縮小済みのSurface
+        self.decode_times = {}  # 名前 -> デコード時間(秒)（ワーカースレッドも書き込むのでdecode_lockで保護）
+        self.decode_lock = threading.Lock()
+        self.convert_time = 0.0
+        self.executor = None
+
+    def preload(self, names=PRELOAD_IMAGES):
+        """ワーカースレッドでデコードを始める（表示モード設定前に呼んでよい）"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-loader")
+        for name in names:
+            if name not in self.surfaces and name not in self.pending:
+                self.pending[name] = self.executor.submit(self._decode, name)
+
+    def _decode(self, name):
+        """ワーカースレッド側: ファイルを読み込んでデコードだけ行う"""
+        start = time.perf_counter()
+        surface = pygame.image.load(os.path.join(self.img_dir, name))
+        with self.decode_lock:
+            self.decode_times[name] = time.perf_counter() - start
+        return surface
+
+    def get(self, name, size=None):
+        """共有Surfaceを取得（sizeを指定すると拡大縮小済みのものを返す）"""
+        surface = self.surfaces.get(name)
+        if surface is None:
+            future = self.pending.pop(name, None)
+            if future is not None:
+                surface = future.result()  # 読み込みエラーはここで呼び出し元に伝わる
+            else:
+                surface = self._decode(name)
+
+            # convertは表示モード設定後にメインスレッドで行う
+            start = time.perf_counter()
+            if surface.get_flags() & pygame.SRCALPHA:
+                surface = surface.convert_alpha()
+            else:
+                surface = surface.convert()
+            self.convert_time += time.perf_counter() - start
+            self.surfaces[name] = surface
+
+        if size is None or surface.get_size() == size:
+            return surface
+        key = (name, size)
+        scaled = self.scaled.get(key)
+        if scaled is None:
+            scaled = pygame.transform.scale(surface, size)
+            self.scaled[key] = scaled
+        return scaled
+
+    def get_memory_usage(self):
+        """保持しているSurfaceのおおよそのバイト数"""
+        surfaces = list(self.surfaces.values()) + list(self.scaled.values())
+        return sum(s.get_bytesize() * s.get_width() * s.get_height() for s in surfaces)
+
+    def get_stats_text(self):
+        """パフォーマンス表示用の文字列"""
+        with self.decode_lock:
+            decode_ms = sum(self.decode_times.values()) * 1000
+        return (f"Assets: {len(self.surfaces)} loaded ({len(self.scaled)} scaled) "
+                f"decode {decode_ms:.0f}ms convert {self.convert_time * 1000:.0f}ms "
+                f"{self.get_memory_usage() / (1024 * 1024):.1f}MB")
+
+
+# ゲーム全体で共有するアセット
+assets = AssetManager()
@@ -0,0 +1,107 @@
+"""当たり判定バックエンドのベンチマーク
+
+弾と敵を同数ずつ画面内にランダム配置し、1フレーム分の処理
+（build + 全弾のquery）にかかる時間をバックエンドごとに計測する。
+結果は総当たりと一致するか検証してから表に出力し、
+matplotlibがあればグラフも保存する。
+
+使い方: python benchmarks/collision_benchmark.py [--counts 10 100 1000] [--output collision_benchmark.png]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+from settings import *
+from collision import COLLISION_BACKENDS, brute_force_query
+
+DEFAULT_COUNTS = [10, 50, 100, 250, 500, 1000, 2500, 5000]
+# 総当たりは件数の2乗で遅くなるため、この件数を超えたら計測しない
+BRUTE_FORCE_LIMIT = 2500
+
+
+def make_scene(count, seed):
+    """敵と弾の矩形をcount個ずつ生成"""
+    rng = random.Random(seed)
+    enemies = [pygame.Rect(rng.randint(0, SCREEN_WIDTH), rng.randint(-ENEMY_SIZE, SCREEN_HEIGHT), ENEMY_SIZE, ENEMY_SIZE)
+               for _ in range(count)]
+    bullets = []
+    for _ in range(count):
+        if rng.random() < 0.05:
+            # 一部はレーザー（縦長）
+            bullets.append(pygame.Rect(rng.randint(0, SCREEN_WIDTH), 0, 6, rng.randint(100, SCREEN_HEIGHT)))
+        else:
+            bullets.append(pygame.Rect(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT), BULLET_SIZE, BULLET_SIZE * 2))
+    return enemies, bullets
+
+def run_frame(backend, enemies, bullets):
+    """1フレーム分の判定を行い、結果を返す"""
+    backend.build(enemies)
+    return [backend.query(bullet) for bullet in bullets]
+
+def measure(backend, enemies, bullets, min_time=0.2):
+    """1フレームあたりの平均時間(ミリ秒)を計測"""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        run_frame(backend, enemies, bullets)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / runs * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="当たり判定バックエンドのベンチマーク")
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS, help="弾・敵それぞれの数")
+    parser.add_argument("--output", default="collision_benchmark.png", help="グラフの保存先")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    names = list(COLLISION_BACKENDS)
+    results = {name: [] for name in names}
+
+    print(f"{'count':>6} " + " ".join(f"{name:>10}" for name in names) + "   (ms/frame)")
+    for count in args.counts:
+        enemies, bullets = make_scene(count, args.seed)
+        expected = [brute_force_query(enemies, bullet) for bullet in bullets]
+        row = []
+        for name in names:
+            if name == 'brute' and count > BRUTE_FORCE_LIMIT:
+                results[name].append(None)
+                row.append(f"{'-':>10}")
+                continue
+            backend = COLLISION_BACKENDS[name]()
+            if run_frame(backend, enemies, bullets) != expected:
+                raise SystemExit(f"エラー: {name} の結果が総当たりと一致しません (count={count})")
+            elapsed_ms = measure(backend, enemies, bullets)
+            results[name].append(elapsed_ms)
+            row.append(f"{elapsed_ms:>10.3f}")
+        print(f"{count:>6} " + " ".join(row))
+
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlibが見つからないため、グラフは出力しません")
+        return
+
+    for name in names:
+        points = [(count, value) for count, value in zip(args.counts, results[name]) if value is not None]
+        plt.plot([p[0] for p in points], [p[1] for p in points], marker="o", label=name)
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("entities per side")
+    plt.ylabel("ms per frame")
+    plt.legend()
+    plt.grid(True, which="both", alpha=0.3)
+    plt.savefig(args.output)
+    print(f"グラフを保存しました: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
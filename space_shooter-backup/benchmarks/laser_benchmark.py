@@ -0,0 +1,94 @@
+"""レーザー描画のベンチマーク
+
+同時に存在するレーザー（既定10本）を、毎フレーム発光用Surfaceを作る従来の描画と、
+事前描画したビームを1回blitする現在の描画で比較する。
+画面の差分（ピクセル数と最大差）も表示する。
+
+使い方: python benchmarks/laser_benchmark.py [--lasers 10] [--frames 500]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from settings import *
+from bullet import Laser
+
+
+def draw_laser_legacy(laser, screen):
+    """以前のLaser.draw（発光レイヤーを毎回作成）"""
+    if laser.direction_y == -1:  # 上向き
+        start_pos = (laser.x, laser.y)
+        end_pos = (laser.x, laser.y - laser.length)
+    else:  # 下向き
+        start_pos = (laser.x, laser.y)
+        end_pos = (laser.x, laser.y + laser.length)
+    for i in range(6):
+        width = laser.width + i * 6
+        alpha = max(30, 180 - i * 30)
+        color = (100 + i*25, 255, 255, alpha)
+        surf = pygame.Surface((width, abs(end_pos[1] - start_pos[1])), pygame.SRCALPHA)
+        pygame.draw.rect(surf, color, (0, 0, width, abs(end_pos[1] - start_pos[1])))
+        if laser.direction_y == -1:
+            screen.blit(surf, (laser.x - width//2, end_pos[1]))
+        else:
+            screen.blit(surf, (laser.x - width//2, start_pos[1]))
+    pygame.draw.line(screen, (255,255,255), start_pos, end_pos, 4)
+    pygame.draw.line(screen, (200,255,255), start_pos, end_pos, 2)
+
+def draw_laser_cached(laser, screen):
+    """現在のLaser.draw"""
+    laser.draw(screen)
+
+def measure(draw_func, lasers, screen, frames):
+    """1フレームあたりの平均時間(ミリ秒)を計測"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill(BLACK)
+        for laser in lasers:
+            draw_func(laser, screen)
+    return (time.perf_counter() - start) / frames * 1000
+
+def compare(lasers, screen):
+    """両方の描画結果を比較して(違うピクセル数, 最大差)を返す"""
+    results = []
+    for draw_func in (draw_laser_legacy, draw_laser_cached):
+        screen.fill(BLACK)
+        for laser in lasers:
+            draw_func(laser, screen)
+        results.append(pygame.image.tobytes(screen, "RGB"))
+    legacy, cached = results
+    diff_pixels = sum(1 for i in range(0, len(legacy), 3) if legacy[i:i + 3] != cached[i:i + 3])
+    max_diff = max((abs(a - b) for a, b in zip(legacy, cached)), default=0)
+    return diff_pixels, max_diff
+
+def main():
+    parser = argparse.ArgumentParser(description="レーザー描画のベンチマーク")
+    parser.add_argument("--lasers", type=int, default=10, help="同時に描画するレーザーの数")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = random.Random(args.seed)
+    lasers = [Laser(rng.randint(50, SCREEN_WIDTH - 50), rng.randint(LASER_LENGTH, SCREEN_HEIGHT)) for _ in range(args.lasers)]
+
+    diff_pixels, max_diff = compare(lasers, screen)
+    legacy_ms = measure(draw_laser_legacy, lasers, screen, args.frames)
+    cached_ms = measure(draw_laser_cached, lasers, screen, args.frames)
+
+    print(f"lasers: {args.lasers}  frames: {args.frames}")
+    print(f"{'legacy':>8}: {legacy_ms:8.3f} ms/frame")
+    print(f"{'cached':>8}: {cached_ms:8.3f} ms/frame  (x{legacy_ms / cached_ms:.1f})")
+    print(f"差分: {diff_pixels} px (最大 {max_diff})")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,17 @@ import os
 from settings import *
 from boss.boss_bullet import BossBullet
 from boss.environmental_boss import EnvironmentalBoss
+from asset_manager import assets
+from sprite_cache import get_scaled_sprite, sprite_cache
 
 class Boss:
     """東方風ボスの基底クラス"""
+    # 当たり判定の設定
+    collision_layer = LAYER_BOSS
+    collision_mask = 0
+    round_hitbox = False
+    swept_collision = False
+    mask_collision = False
     
     def __init__(self, x, y, boss_type="basic", font=None, base_dir=None, player_level=1, game=None):
         self.x = x
@@ -50,6 +58,8 @@ class Boss:
         self.entrance_timer = 180
         
         self.init_boss_type()
+        if self.image:
+            sprite_cache.prewarm(self.image, (self.width, self.height))
     
     def init_boss_type(self):
         total_health = 0
@@ -60,9 +70,7 @@ class Boss:
                 {"name": "光の乱舞", "pattern": "light_burst", "duration": 5400, "spell_health": 150}
             ]
             try:
-                image_path = os.path.join(self.base_dir, "assets", "img", "faily.png")
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (self.width, self.height))
+                self.image = assets.get("faily.png", (self.width, self.height))
             except pygame.error as e:
                 print(f"Error loading boss image: {e}")
                 self.image = None
@@ -75,9 +83,7 @@ class Boss:
                 {"name": "螺旋の呪文", "pattern": "spiral_curse", "duration": 5400, "spell_health": 300}
             ]
             try:
-                image_path = os.path.join(self.base_dir, "assets", "img", "magichuman.png")
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (self.width, self.height))
+                self.image = assets.get("magichuman.png", (self.width, self.height))
             except pygame.error as e:
                 print(f"Error loading boss image: {e}")
                 self.image = None
@@ -91,9 +97,7 @@ class Boss:
                 {"name": "究極竜破", "pattern": "ultimate_blast", "duration": 5400, "spell_health": 500}
             ]
             try:
-                image_path = os.path.join(self.base_dir, "assets", "img", "dragon.png")
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (self.width, self.height))
+                self.image = assets.get("dragon.png", (self.width, self.height))
             except pygame.error as e:
                 print(f"Error loading boss image: {e}")
                 self.image = None
@@ -304,7 +308,8 @@ class Boss:
             color = (*WHITE[:3], alpha) if len(WHITE) == 4 else WHITE
         
         if self.image:
-            screen.blit(self.image, self.rect)
+            tint = HIT_FLASH_TINT if self.flash_timer > 0 else None
+            screen.blit(get_scaled_sprite(self.image, (self.width, self.height), tint), self.rect)
         else:
             if self.boss_type == "fairy":
                 pygame.draw.circle(screen, color, (int(self.x), int(self.y)), 30)
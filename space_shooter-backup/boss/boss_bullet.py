@@ -2,16 +2,26 @@ import pygame
 import math
 import random
 from settings import *
+from bullet_atlas import get_bullet_sprite, draw_bullets
+from rotation_cache import get_polygon_sprite, get_beam_sprite
 
 class BossBullet:
     """ボス専用弾丸クラス - 複雑な動作パターンを持つ"""
+    # 当たり判定の設定
+    collision_layer = LAYER_BOSS_BULLET
+    collision_mask = 0
+    swept_collision = True  # 高速時は移動経路で判定
+    mask_collision = False
     
     def __init__(self, x, y, vx, vy, bullet_type="normal", color=WHITE, size=8, damage=1, game=None):
         self.x = float(x)
         self.y = float(y)
+        self.prev_x = self.x  # 前フレームの位置（連続当たり判定用）
+        self.prev_y = self.y
         self.vx = float(vx)
         self.vy = float(vy)
         self.bullet_type = bullet_type
+        self.round_hitbox = bullet_type != "laser"  # レーザーは矩形、それ以外は円形で判定
         self.color = color
         self.size = size
         self.damage = damage
@@ -95,6 +105,8 @@ class BossBullet:
             return []
         
         self.age += 1
+        self.prev_x = self.x
+        self.prev_y = self.y
         
         # 寿命チェック
         if self.age > self.max_age:
@@ -369,72 +381,34 @@ class BossBullet:
         else:
             self.draw_normal(screen)
     
-    def draw_normal(self, screen):
-        """通常弾丸の描画"""
-        # アルファ値を考慮した色
-        if self.alpha < 255:
-            # 半透明描画は複雑なので、単純化
-            color = self.color
-        else:
+    def get_sprite(self):
+        """アトラスにある見た目なら(Surface, 中心オフセット)を返す（ない場合はNone）"""
+        if self.bullet_type == "splitting":
             color = self.color
-        
-        # 弾丸の形状（タイプ別）
-        if self.bullet_type == "homing":
-            # 誘導弾：三角形
-            points = []
-            for i in range(3):
-                angle = self.angle + i * 120 * math.pi / 180
-                px = self.x + math.cos(angle) * self.size
-                py = self.y + math.sin(angle) * self.size
-                points.append((int(px), int(py)))
-            pygame.draw.polygon(screen, color, points)
-            
-        elif self.bullet_type == "spiral":
-            # 螺旋弾：回転する四角形
-            points = []
-            for i in range(4):
-                angle = self.rotation + i * 90 * math.pi / 180
-                px = self.x + math.cos(angle) * self.size
-                py = self.y + math.sin(angle) * self.size
-                points.append((int(px), int(py)))
-            pygame.draw.polygon(screen, color, points)
-            
-        elif self.bullet_type == "splitting":
-            # 分裂弾：点滅する円
             if self.split_timer < 30 and self.split_timer % 6 < 3:
                 color = RED
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size, 2)
-            
-        else:
-            # 通常弾：円形
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
-            
-            # 光沢効果
-            highlight_size = max(2, self.size - 3)
-            highlight_color = tuple(min(255, c + 50) for c in color[:3])
-            pygame.draw.circle(screen, highlight_color, 
-                             (int(self.x - self.size//3), int(self.y - self.size//3)), 
-                             highlight_size//2)
+            return get_bullet_sprite("ringed", color, self.size)
+        elif self.bullet_type == "homing":
+            # 誘導弾：進行方向を向いた三角形
+            return get_polygon_sprite(3, self.size, self.color, self.angle)
+        elif self.bullet_type == "spiral":
+            # 螺旋弾：回転する四角形
+            return get_polygon_sprite(4, self.size, self.color, self.rotation)
+        elif self.bullet_type == "laser":
+            return get_beam_sprite(self.length, self.width, self.color, self.angle)
+        elif self.bullet_type == "explosive":
+            return None
+        return get_bullet_sprite("glossy", self.color, self.size)
+
+    def draw_normal(self, screen):
+        """通常弾丸の描画（形状は弾種ごとにアトラス・回転キャッシュから取得）"""
+        surface, offset = self.get_sprite()
+        screen.blit(surface, (int(self.x) - offset, int(self.y) - offset))
     
     def draw_laser(self, screen):
-        """レーザー弾の描画"""
-        # レーザーの向きを計算
-        end_x = self.x + math.cos(self.angle) * self.length
-        end_y = self.y + math.sin(self.angle) * self.length
-        
-        # レーザー本体
-        pygame.draw.line(screen, self.color, 
-                        (int(self.x), int(self.y)), 
-                        (int(end_x), int(end_y)), 
-                        self.width)
-        
-        # 中心線
-        center_color = tuple(min(255, c + 100) for c in self.color[:3])
-        pygame.draw.line(screen, center_color,
-                        (int(self.x), int(self.y)), 
-                        (int(end_x), int(end_y)), 
-                        max(1, self.width//2))
+        """レーザー弾の描画（角度ごとに事前描画した光線）"""
+        surface, offset = self.get_sprite()
+        screen.blit(surface, (int(self.x) - offset, int(self.y) - offset))
     
     def draw_explosive(self, screen):
         """爆発弾の描画"""
@@ -485,8 +459,7 @@ class BossBulletManager:
     
     def draw(self, screen):
         """全弾丸の描画"""
-        for bullet in self.bullets:
-            bullet.draw(screen)
+        draw_bullets(screen, self.bullets)
     
     def get_bullets(self):
         """アクティブな弾丸リストを取得"""
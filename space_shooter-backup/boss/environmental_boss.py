@@ -1,19 +1,27 @@
 import pygame
 import random
 from settings import *
+from asset_manager import assets
 from boss.moving_wall import MovingWall
 from boss.gravity_field import GravityField
+from sprite_cache import get_scaled_sprite, sprite_cache
 
 class EnvironmentalBoss:
+    # 当たり判定の設定
+    collision_layer = LAYER_BOSS
+    collision_mask = 0
+    round_hitbox = False
+    swept_collision = False
+    mask_collision = False
+
     # 画像をクラス変数として一度だけロード
     image = None
+    light_sprites = {}  # 半径 -> 明るい円の乗算用画像
+    darkness_shades = {}  # 画面サイズ -> 一様に暗くする乗算用画像
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            import os
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'environmental.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('environmental.png')
 
     def __init__(self, x, y, player_level, game=None):
         self.load_image()
@@ -33,6 +41,8 @@ class EnvironmentalBoss:
         self.moving_walls = pygame.sprite.Group()
         self.gravity_fields = []
         self.game = game  # 追加: Gameインスタンス参照
+        if self.image:
+            sprite_cache.prewarm(self.image, self.size)
 
         self.phase_transition_hp = {
             2: self.max_hp * 0.66,
@@ -128,7 +138,7 @@ class EnvironmentalBoss:
     def draw(self, screen):
         if self.active:
             if self.image:
-                img = pygame.transform.scale(self.image, self.size)
+                img = get_scaled_sprite(self.image, self.size, HIT_FLASH_TINT if self.flash_timer > 0 else None)
                 rect = img.get_rect(center=(self.x, self.y))
                 screen.blit(img, rect)
             else:
@@ -143,16 +153,54 @@ class EnvironmentalBoss:
             if self.darkness_active:
                 self.draw_darkness(screen)
 
-    def draw_darkness(self, screen):
-        dark_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        dark_surface.fill((0, 0, 0, 200))
-        
-        # プレイヤー周辺を明るくする
-        light_rect = pygame.Rect(0, 0, self.vision_radius * 2, self.vision_radius * 2)
-        light_rect.center = self.rect.center # ボス中心に明るい円
-        pygame.draw.circle(dark_surface, (0,0,0,0), light_rect.center, self.vision_radius)
+    @classmethod
+    def get_light_sprite(cls, radius):
+        """明るい円の乗算用画像を取得（中心は255で明るさそのまま、外側ほど暗くなるぼかし付き、半径ごとに一度だけ作成）"""
+        sprite = cls.light_sprites.get(radius)
+        if sprite is None:
+            edge = DARKNESS_SOFT_EDGE
+            outer = radius - edge // 2 + edge  # ぼかしの最も外側の円の半径
+            sprite = pygame.Surface((outer * 2 + 1, outer * 2 + 1))
+            sprite.fill((255 - DARKNESS_ALPHA,) * 3)
+            # 外側から内側へ、暗さを下げながら円を重ねて縁をぼかす
+            for i in range(edge, -1, -1):
+                level = 255 - DARKNESS_ALPHA * i // (edge + 1)
+                pygame.draw.circle(sprite, (level,) * 3, (outer, outer), radius - edge // 2 + i)
+            cls.light_sprites[radius] = sprite
+        return sprite
 
-        screen.blit(dark_surface, (0,0))
+    @classmethod
+    def get_darkness_shade(cls, size):
+        """画面全体を一様に暗くする乗算用画像を取得（画面サイズごとに一度だけ作成）"""
+        shade = cls.darkness_shades.get(size)
+        if shade is None:
+            shade = pygame.Surface(size)
+            shade.fill((255 - DARKNESS_ALPHA,) * 3)
+            cls.darkness_shades.clear()
+            cls.darkness_shades[size] = shade
+        return shade
+
+    def draw_darkness(self, screen):
+        """暗転を描画（明るい円の画像と、その外側の帯を乗算でblitする）"""
+        sprite = self.get_light_sprite(self.vision_radius)
+        shade = self.get_darkness_shade(screen.get_size())
+        sprite_rect = sprite.get_rect(center=self.rect.center)
+        screen_rect = screen.get_rect()
+        visible = sprite_rect.clip(screen_rect)
+        if not visible.width or not visible.height:
+            # 明るい円が画面外（登場中など）なら画面全体を暗くする
+            screen.blit(shade, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+            return
+
+        screen.blit(sprite, sprite_rect, special_flags=pygame.BLEND_RGB_MULT)
+        # 明るい円の画像の外側（上下の帯と左右の帯）
+        width, height = screen_rect.size
+        for band in (pygame.Rect(0, 0, width, visible.top),
+                     pygame.Rect(0, visible.bottom, width, height - visible.bottom),
+                     pygame.Rect(0, visible.top, visible.left, visible.height),
+                     pygame.Rect(visible.right, visible.top, width - visible.right, visible.height)):
+            if band.width > 0 and band.height > 0:
+                screen.blit(shade, band, band, special_flags=pygame.BLEND_RGB_MULT)
 
     def draw_health_bar(self, screen):
         bar_width = self.size[0] * 1.5
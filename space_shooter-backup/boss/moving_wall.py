@@ -3,6 +3,13 @@ import random
 from settings import *
 
 class MovingWall(pygame.sprite.Sprite):
+    # 当たり判定の設定
+    collision_layer = LAYER_WALL
+    collision_mask = 0
+    round_hitbox = False
+    swept_collision = False
+    mask_collision = False
+
     def __init__(self, game=None):
         super().__init__()
         self.width = 20
@@ -2,11 +2,24 @@ import pygame
 import math
 import random
 from settings import *
+from bullet_atlas import get_bullet_sprite
+from utils import draw_particles
 
 class Bullet:
+    # 当たり判定の設定（敵の弾は__init__でレイヤーを切り替える）
+    collision_layer = LAYER_PLAYER_BULLET
+    collision_mask = LAYER_ENEMY | LAYER_BOSS
+    round_hitbox = True  # 円形で判定
+    penetrating = False  # 貫通しない
+    swept_collision = True  # 高速時は移動経路で判定
+    band_query = False  # 縦帯インデックスで判定するか
+    mask_collision = False
+
     def __init__(self, x, y, direction_y=-1, angle=0, player_bullet=None, angle_override=None, bullet_type="normal", damage=1, game=None):
         self.x = x
         self.y = y
+        self.prev_x = x  # 前フレームの位置（連続当たり判定用）
+        self.prev_y = y
         self.size = BULLET_SIZE
         self.speed = BULLET_SPEED
         self.direction_y = direction_y  # -1で上向き、1で下向き
@@ -28,6 +41,9 @@ class Bullet:
         # player_bulletがFalseの場合はdirection_yを1（下向き）に設定
         if not self.player_bullet and direction_y == -1:
             self.direction_y = 1
+        if not self.player_bullet:
+            self.collision_layer = LAYER_ENEMY_BULLET
+            self.collision_mask = 0
         
         # 弾種別による設定調整
         self._setup_bullet_properties()
@@ -62,6 +78,8 @@ class Bullet:
             self.is_option_bullet = False
         
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.vel_x
         self.y += self.vel_y
         self.rect.center = (self.x, self.y)
@@ -71,22 +89,22 @@ class Bullet:
             self.x < -10 or self.x > width + 10):
             self.active = False
     
-    def draw(self, screen):
+    def get_sprite(self):
+        """アトラスから見た目を取得（(Surface, 中心オフセット)）"""
         if self.bullet_type == "option":
             # 子機の弾は特別な見た目
-            pygame.draw.circle(screen, CYAN, (int(self.x), int(self.y)), self.size + 1)
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, CYAN, (int(self.x), int(self.y)), self.size - 2)
+            return get_bullet_sprite("option", None, self.size)
         elif self.bullet_type == "boss":
             # ボスの弾は特別な見た目
-            pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.size + 1)
-            pygame.draw.circle(screen, ORANGE, (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), max(1, self.size - 2))
+            return get_bullet_sprite("boss", None, self.size)
         else:
             # 通常の弾
             color = YELLOW if self.player_bullet else RED
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size, 1)
+            return get_bullet_sprite("plain", color, self.size)
+
+    def draw(self, screen):
+        surface, offset = self.get_sprite()
+        screen.blit(surface, (int(self.x) - offset, int(self.y) - offset))
 
 class HomingBullet(Bullet):
     """追尾弾クラス"""
@@ -131,11 +149,16 @@ class HomingBullet(Bullet):
         # 基本の更新処理
         super().update()
     
+    def get_sprite(self):
+        """ターゲットへの線を描く間はまとめて描画しない"""
+        if self.target:
+            return None
+        return get_bullet_sprite("homing", None, self.size)
+
     def draw(self, screen):
         # 追尾弾は特別な見た目
-        pygame.draw.circle(screen, MAGENTA, (int(self.x), int(self.y)), self.size + 2)
-        pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), self.size)
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size - 1)
+        surface, offset = get_bullet_sprite("homing", None, self.size)
+        screen.blit(surface, (int(self.x) - offset, int(self.y) - offset))
         
         # 追尾エフェクト
         if self.target:
@@ -145,9 +168,50 @@ class HomingBullet(Bullet):
                            (int(self.target.x), int(self.target.y)), 1)
 
 class Laser:
+    # 当たり判定の設定
+    collision_layer = LAYER_PLAYER_BULLET
+    collision_mask = LAYER_ENEMY | LAYER_BOSS
+    round_hitbox = False
+    penetrating = True  # 貫通属性
+    swept_collision = True
+    band_query = True  # 縦長なので縦帯インデックスで判定
+    glow_strips = {}  # 幅 -> 発光込みで描画済みのビーム（最下段は中心線の下端の1ライン）
+
+    @classmethod
+    def get_glow_strip(cls, width, length):
+        """発光の重ね塗りと中心線を1枚にしたビームを取得（1ライン分を描いて縦に引き伸ばす）
+
+        幅ごとにこれまでで最長の長さで1枚だけ作り、短いレーザーは上側を切り出して使う。
+        """
+        strip = cls.glow_strips.get(width)
+        if strip is None or strip.get_height() - 1 < length:
+            glow_width = width + 5 * 6
+            center = glow_width // 2
+            # 縦方向には一様なので、数ライン分だけ描いて中央の1ラインを使う
+            rows = pygame.Surface((glow_width, 3), pygame.SRCALPHA)
+            for i in range(6):
+                layer_width = width + i * 6
+                alpha = max(30, 180 - i * 30)
+                color = (100 + i*25, 255, 255, alpha)  # 外側ほど薄いシアン
+                layer = pygame.Surface((layer_width, 3), pygame.SRCALPHA)
+                layer.fill(color)
+                rows.blit(layer, (center - layer_width//2, 0))
+            # 中心の明るい線（線は発光より下端の1ライン分だけ長い）
+            line_row = pygame.Surface((glow_width, 3), pygame.SRCALPHA)
+            for surface in (rows, line_row):
+                pygame.draw.line(surface, (255,255,255), (center, 0), (center, 2), 4)
+                pygame.draw.line(surface, (200,255,255), (center, 0), (center, 2), 2)
+            strip = pygame.Surface((glow_width, length + 1), pygame.SRCALPHA)
+            strip.blit(pygame.transform.scale(rows.subsurface((0, 1, glow_width, 1)), (glow_width, length)), (0, 0))
+            strip.blit(line_row, (0, length), (0, 1, glow_width, 1))
+            cls.glow_strips[width] = strip
+        return strip
+
     def __init__(self, x, y, direction_y=-1, damage=LASER_DAMAGE):
         self.x = x
         self.y = y
+        self.prev_x = x  # 前フレームの位置（連続当たり判定用）
+        self.prev_y = y
         self.start_x = x
         self.start_y = y
         self.width = LASER_WIDTH
@@ -157,7 +221,6 @@ class Laser:
         self.damage = damage
         self.active = True
         self.player_bullet = True
-        self.penetrating = True  # 貫通属性
         self.hits = 0  # ヒット回数
         self.max_hits = 5  # 最大ヒット回数
         self.hit_boss = False  # ボスに当たったかどうか
@@ -168,6 +231,8 @@ class Laser:
             self.rect = pygame.Rect(x - self.width//2, y, self.width, self.length)
 
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.y += self.speed * self.direction_y
         # レーザーの矩形を更新
         if self.direction_y == -1:  # 上向き
@@ -183,26 +248,14 @@ class Laser:
             self.active = False
 
     def draw(self, screen):
-        if self.direction_y == -1:  # 上向き
-            start_pos = (self.x, self.y)
-            end_pos = (self.x, self.y - self.length)
-        else:  # 下向き
-            start_pos = (self.x, self.y)
-            end_pos = (self.x, self.y + self.length)
-        # --- ビームらしいグラデーションと発光 ---
-        for i in range(6):
-            width = self.width + i * 6
-            alpha = max(30, 180 - i * 30)
-            color = (100 + i*25, 255, 255, alpha)  # 外側ほど薄いシアン
-            surf = pygame.Surface((width, abs(end_pos[1] - start_pos[1])), pygame.SRCALPHA)
-            pygame.draw.rect(surf, color, (0, 0, width, abs(end_pos[1] - start_pos[1])))
-            if self.direction_y == -1:
-                screen.blit(surf, (self.x - width//2, end_pos[1]))
-            else:
-                screen.blit(surf, (self.x - width//2, start_pos[1]))
-        # 中心の明るい線
-        pygame.draw.line(screen, (255,255,255), start_pos, end_pos, 4)
-        pygame.draw.line(screen, (200,255,255), start_pos, end_pos, 2)
+        # --- ビームらしいグラデーションと発光（事前描画したものを1回で転送） ---
+        strip = self.get_glow_strip(self.width, self.length)
+        top = int(self.y - self.length if self.direction_y == -1 else self.y)
+        left = int(self.x) - strip.get_width()//2
+        glow_width = strip.get_width()
+        # 発光は上から長さ分、中心線の下端は最下段の1ラインを転送
+        screen.blit(strip, (left, top), (0, 0, glow_width, self.length))
+        screen.blit(strip, (left, top + self.length), (0, strip.get_height() - 1, glow_width, 1))
 
     def hit_enemy(self):
         self.hits += 1
@@ -210,9 +263,20 @@ class Laser:
         self.hit_boss = True
 
 class Bomb:
+    # 当たり判定の設定
+    collision_layer = LAYER_BOMB
+    collision_mask = LAYER_ENEMY | LAYER_BOSS
+    round_hitbox = False
+    penetrating = False
+    swept_collision = True
+    band_query = False
+    damage = 1  # ボスに直撃した場合のダメージ
+
     def __init__(self, x, y, direction_y=-1):
         self.x = x
         self.y = y
+        self.prev_x = x  # 前フレームの位置（連続当たり判定用）
+        self.prev_y = y
         self.size = BOMB_SIZE
         self.speed = BOMB_SPEED
         self.direction_y = direction_y
@@ -227,6 +291,8 @@ class Bomb:
         self.rect = pygame.Rect(x - self.size//2, y - self.size//2, self.size, self.size)
     
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         if not self.exploded:
             # 爆弾の移動
             self.y += self.speed * self.direction_y
@@ -381,6 +447,54 @@ class OptionBulletManager:
         return bullets
 
 class MasterSpark:
+    # 当たり判定の設定
+    collision_layer = LAYER_SPECIAL
+    collision_mask = LAYER_ENEMY | LAYER_BOSS
+    round_hitbox = False
+    swept_collision = False
+    band_query = True  # 縦長なので縦帯インデックスで判定
+    clears_bullets = True  # 範囲内の敵弾・ボス弾を消去する
+    ellipse_base_height = 30  # 発射口の楕円の縦のサイズ
+    overlap_height = 10  # 楕円と四角の重なり部分の高さ
+    beam_layers = {}  # 幅 -> (高さ, 外側のグラデーション, 内側の最小幅レイヤー, 内側の最大幅レイヤー)
+
+    @classmethod
+    def _render_beam_layer(cls, surface_width, height, layers):
+        """四角形と発射口の楕円を幅の広い順に重ねたビームを描画（楕円の下端がheight + overlap_height）"""
+        surface = pygame.Surface((surface_width, height + cls.overlap_height), pygame.SRCALPHA)
+        center = surface_width // 2
+        for current_width, color in layers:
+            # 四角形部分は上端から楕円の開始位置まで、少し重なるように
+            rect_part = pygame.Rect(center - current_width // 2, 0, current_width, height - cls.ellipse_base_height + cls.overlap_height)
+            if rect_part.height > 0:
+                overlay_rect = pygame.Surface(rect_part.size, pygame.SRCALPHA)
+                overlay_rect.fill(color)
+                surface.blit(overlay_rect, rect_part.topleft)
+            # 楕円部分
+            ellipse_draw_rect = pygame.Rect(center - current_width // 2, height - cls.ellipse_base_height, current_width, cls.ellipse_base_height + cls.overlap_height)
+            overlay_ellipse = pygame.Surface(ellipse_draw_rect.size, pygame.SRCALPHA)
+            pygame.draw.ellipse(overlay_ellipse, color, overlay_ellipse.get_rect())
+            surface.blit(overlay_ellipse, ellipse_draw_rect.topleft)
+        return surface
+
+    @classmethod
+    def get_beam_layers(cls, width, height):
+        """ビームの描画済みレイヤーを取得（高さはバケット単位で切り上げ、高いものは低いビームにも使い回す）"""
+        cached = cls.beam_layers.get(width)
+        if cached is None or cached[0] < height:
+            bucket_height = -(-max(1, int(height)) // MASTER_SPARK_HEIGHT_BUCKET) * MASTER_SPARK_HEIGHT_BUCKET
+            # 複数の半透明な矩形と楕円を重ねてグラデーションを表現（外側ほど透明）
+            outer = cls._render_beam_layer(width, bucket_height,
+                                           [(width - i * (width // 5), (255, 255, 100, 200 - i * 40)) for i in range(5)])
+            # 最も内側の明るい部分は最小幅と最大幅の2枚を用意し、脈動は最大幅側の透明度で表現
+            inner_min_width = width // 3
+            inner_max_width = width // 3 + width // 6
+            inner_min = cls._render_beam_layer(inner_min_width, bucket_height, [(inner_min_width, (255, 255, 200, 255))])
+            inner_max = cls._render_beam_layer(inner_max_width, bucket_height, [(inner_max_width, (255, 255, 200, 255))])
+            cached = (bucket_height, outer, inner_min, inner_max)
+            cls.beam_layers[width] = cached
+        return cached
+
     def __init__(self, player, boss=None):
         self.player = player
         self.boss = boss # ボスオブジェクトを保持
@@ -392,6 +506,8 @@ class MasterSpark:
         # プレイヤーのY座標から画面上部までをカバーする矩形
         self.rect = pygame.Rect(self.x - self.width // 2, 0, self.width, self.y)
         self.pulse_timer = 0
+        self.pulse_key = None  # pulse_layerの元になったビームのレイヤー（幅, 高さ）
+        self.pulse_layer = None  # 脈動用に透明度を変える、内側の最大幅レイヤーのコピー
         self.spark_particles = []
 
         # ボスがいる場合、現在のスペルカードの体力の30%を削るようにダメージを計算
@@ -420,7 +536,8 @@ class MasterSpark:
         if random.random() < 0.3: # 発生頻度
             particle_x = random.randint(int(self.x - self.width / 2), int(self.x + self.width / 2))
             particle_y = random.randint(0, int(self.y))
-            self.spark_particles.append({'x': particle_x, 'y': particle_y, 'life': 30, 'vx': random.uniform(-1, 1), 'vy': random.uniform(-1, 1)})
+            self.spark_particles.append({'x': particle_x, 'y': particle_y, 'life': 30, 'max_life': 30, 'size': 2, 'color': WHITE,
+                                         'vx': random.uniform(-1, 1), 'vy': random.uniform(-1, 1)})
 
         # パーティクル更新
         for p in self.spark_particles[:]:
@@ -431,58 +548,26 @@ class MasterSpark:
                 self.spark_particles.remove(p)
 
     def draw(self, screen):
-        # 発射口の楕円部分の高さ
-        ellipse_base_height = 30 # 楕円の縦のサイズ
-        overlap_height = 10 # 楕円と四角の重なり部分の高さ
-
-        # レーザーの本体
-        # 複数の半透明な矩形と楕円を重ねて描画し、グラデーションを表現
-        for i in range(5):
-            current_width = self.width - i * (self.width // 5)
-            alpha = 200 - i * 40  # 外側ほど透明に
-            color = (255, 255, 100, alpha)  # 黄色っぽい色
-
-            # 四角形部分
-            # 矩形は画面上部から楕円の開始位置まで、少し重なるように
-            rect_part = pygame.Rect(self.x - current_width // 2, 0, current_width, self.y - ellipse_base_height + overlap_height)
-            if rect_part.height > 0:
-                overlay_rect = pygame.Surface(rect_part.size, pygame.SRCALPHA)
-                overlay_rect.fill(color)
-                screen.blit(overlay_rect, rect_part.topleft)
-
-            # 楕円部分
-            # 楕円はplayer.yを底辺として、ellipse_base_heightの高さを持つ
-            # 楕円の描画範囲を少し広げて、四角形部分と重なるようにする
-            ellipse_draw_rect = pygame.Rect(self.x - current_width // 2, self.y - ellipse_base_height, current_width, ellipse_base_height + overlap_height)
-            overlay_ellipse = pygame.Surface(ellipse_draw_rect.size, pygame.SRCALPHA)
-            pygame.draw.ellipse(overlay_ellipse, color, overlay_ellipse.get_rect())
-            screen.blit(overlay_ellipse, ellipse_draw_rect.topleft)
+        # レーザーの本体（楕円の下端がプレイヤーの位置に来るように配置し、上にはみ出した分は画面外）
+        bucket_height, outer, inner_min, inner_max = self.get_beam_layers(self.width, self.y)
+        top = int(self.y) - bucket_height
+        screen.blit(outer, (int(self.x) - outer.get_width() // 2, top))
 
         # 最も内側の明るい部分（脈動）
         pulse_factor = (math.sin(self.pulse_timer) + 1) / 2 # 0から1の間で脈動
-        inner_width = self.width // 3 + (self.width // 6 * pulse_factor)
-
-        # 内側の四角形部分
-        inner_rect_part = pygame.Rect(self.x - inner_width // 2, 0, inner_width, self.y - ellipse_base_height + overlap_height)
-        if inner_rect_part.height > 0:
-            inner_overlay_rect = pygame.Surface(inner_rect_part.size, pygame.SRCALPHA)
-            inner_overlay_rect.fill((255, 255, 200, 255))  # より明るい黄色
-            screen.blit(inner_overlay_rect, inner_rect_part.topleft)
-
-        # 内側の楕円部分
-        inner_ellipse_draw_rect = pygame.Rect(self.x - inner_width // 2, self.y - ellipse_base_height, inner_width, ellipse_base_height + overlap_height)
-        inner_overlay_ellipse = pygame.Surface(inner_ellipse_draw_rect.size, pygame.SRCALPHA)
-        pygame.draw.ellipse(inner_overlay_ellipse, (255, 255, 200, 255), inner_overlay_ellipse.get_rect())  # より明るい黄色
-        screen.blit(inner_overlay_ellipse, inner_ellipse_draw_rect.topleft)
+        screen.blit(inner_min, (int(self.x) - inner_min.get_width() // 2, top))
+        # キャッシュのレイヤーは他のビームと共有なので、透明度は自分用のコピーに設定する
+        if self.pulse_key != (self.width, bucket_height):
+            self.pulse_key = (self.width, bucket_height)
+            self.pulse_layer = inner_max.copy()
+        self.pulse_layer.set_alpha(int(255 * pulse_factor))
+        screen.blit(self.pulse_layer, (int(self.x) - inner_max.get_width() // 2, top))
 
         # 中心線
         pygame.draw.line(screen, WHITE, (self.x, 0), (self.x, self.y), 4)
 
-        # パーティクルの描画
-        for p in self.spark_particles:
-            particle_alpha = int(255 * (p['life'] / 30))
-            particle_color = (255, 255, 255, particle_alpha)
-            pygame.draw.circle(screen, particle_color, (int(p['x']), int(p['y'])), 2)
+        # パーティクルの描画（共通のパーティクル描画で寿命に応じてフェード）
+        draw_particles(screen, self.spark_particles)
     
     def is_point_in_range(self, x, y):
         """指定された座標がMasterSparkの範囲内にあるかチェック"""
@@ -498,6 +583,11 @@ class MasterSpark:
             print(f"MasterSpark範囲チェックエラー: {e}")
             return False
     
+    def get_band(self):
+        """MasterSparkの範囲を縦帯 (x0, x1, y0, y1) として取得（is_point_in_rangeと同じ範囲）"""
+        half_width = self.width // 2
+        return (self.x - half_width, self.x + half_width, 0, self.y)
+
     def get_range_rect(self):
         """MasterSparkの範囲を表す矩形を取得"""
         try:
@@ -0,0 +1,74 @@
+import pygame
+from settings import *
+
+# (種類, 色, サイズ) -> (描画済みSurface, 中心までのオフセット)
+_bullet_sprites = {}
+
+
+def _render_bullet(kind, color, size):
+    """弾1発分を小さなSurfaceに描画（pygame.drawの結果と同じピクセルになる）"""
+    center = size + 3  # 一番大きい円(size + 2)が収まる余白
+    surface = pygame.Surface((center * 2 + 1, center * 2 + 1), pygame.SRCALPHA)
+    pos = (center, center)
+    if kind == "plain":
+        pygame.draw.circle(surface, color, pos, size)
+        pygame.draw.circle(surface, WHITE, pos, size, 1)
+    elif kind == "option":
+        pygame.draw.circle(surface, CYAN, pos, size + 1)
+        pygame.draw.circle(surface, WHITE, pos, size)
+        pygame.draw.circle(surface, CYAN, pos, size - 2)
+    elif kind == "boss":
+        pygame.draw.circle(surface, RED, pos, size + 1)
+        pygame.draw.circle(surface, ORANGE, pos, size)
+        pygame.draw.circle(surface, YELLOW, pos, max(1, size - 2))
+    elif kind == "homing":
+        pygame.draw.circle(surface, MAGENTA, pos, size + 2)
+        pygame.draw.circle(surface, YELLOW, pos, size)
+        pygame.draw.circle(surface, WHITE, pos, size - 1)
+    elif kind == "glossy":
+        # 円＋左上の光沢
+        pygame.draw.circle(surface, color, pos, size)
+        highlight_size = max(2, size - 3)
+        highlight_color = tuple(min(255, c + 50) for c in color[:3])
+        pygame.draw.circle(surface, highlight_color, (center - size // 3, center - size // 3), highlight_size // 2)
+    elif kind == "ringed":
+        pygame.draw.circle(surface, color, pos, size)
+        pygame.draw.circle(surface, WHITE, pos, size, 2)
+    else:
+        raise ValueError(f"unknown bullet sprite kind: {kind}")
+    return surface, center
+
+def get_bullet_sprite(kind, color, size):
+    """弾の見た目を取得（組み合わせごとに初回だけ描画してアトラスに保存）"""
+    key = (kind, color, size)
+    sprite = _bullet_sprites.get(key)
+    if sprite is None:
+        sprite = _render_bullet(kind, color, size)
+        _bullet_sprites[key] = sprite
+    return sprite
+
+def draw_bullets(screen, bullets):
+    """弾のリストを描画（アトラスにある弾はまとめて1回のblitsで転送）"""
+    batch = []
+    others = []
+    for bullet in bullets:
+        if not bullet.active:
+            continue
+        get_sprite = getattr(bullet, 'get_sprite', None)
+        sprite = get_sprite() if get_sprite else None
+        if sprite is None:
+            # レーザーや爆弾などアトラスにない弾は個別に描画
+            others.append(bullet)
+            continue
+        surface, offset = sprite
+        batch.append((surface, (int(bullet.x) - offset, int(bullet.y) - offset)))
+
+    if batch:
+        screen.blits(batch, doreturn=False)
+    for bullet in others:
+        bullet.draw(screen)
+
+def get_atlas_stats_text():
+    """パフォーマンス表示用の文字列"""
+    memory = sum(s.get_bytesize() * s.get_width() * s.get_height() for s, _ in _bullet_sprites.values())
+    return f"Bullet atlas: {len(_bullet_sprites)} sprites {memory / 1024:.0f}KB"
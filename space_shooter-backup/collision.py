@@ -0,0 +1,469 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import pygame
+from settings import *
+
+# numpyがあれば危険物とプレイヤーの判定を配列演算でまとめて行う
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# ピクセル単位の当たり判定用マスクのキャッシュ
+# （どちらもMASK_CACHE_SIZEを超えたら古いものから破棄）
+_sprite_masks = OrderedDict()  # (画像, サイズ) -> Mask
+_filled_masks = OrderedDict()  # サイズ -> 全ピクセルが立ったMask
+
+
+def brute_force_query(rects, rect):
+    """全ての矩形と総当たりで判定し、衝突したインデックスを返す（検証用）"""
+    return [index for index, other in enumerate(rects) if rect.colliderect(other)]
+
+
+def _normalized(rect):
+    """colliderectと同じく負の幅・高さを反転させた矩形を返す（正の矩形はそのまま）"""
+    if rect.width >= 0 and rect.height >= 0:
+        return rect
+    rect = rect.copy()
+    rect.normalize()
+    return rect
+
+
+# 各ブロードフェーズは同じインターフェースを持つ
+#   build(rects): 毎フレーム矩形リストを登録
+#   query(rect):  rectと衝突する矩形のインデックスを登録順で返す
+
+class BruteForceBroadphase:
+    """総当たり（基準実装）"""
+    def __init__(self):
+        self.rects = []
+
+    def build(self, rects):
+        """矩形リストを登録"""
+        self.rects = rects
+
+    def query(self, rect):
+        """rectと衝突する矩形のインデックスを登録順で返す"""
+        return brute_force_query(self.rects, rect)
+
+
+class SpatialHashGrid:
+    """一様グリッドによる空間ハッシュ（当たり判定のブロードフェーズ）
+
+    毎フレームbuildで登録し直し、queryでは重なるセルの矩形だけを判定する。
+    結果は登録順（リストの順番）に並べて返すので、総当たりと同じ順序で処理できる。
+    """
+    def __init__(self, cell_size=COLLISION_GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = []
+
+    def _cell_range(self, rect):
+        """矩形が重なるセルの範囲を取得"""
+        size = self.cell_size
+        rect = _normalized(rect)
+        left = rect.left // size
+        top = rect.top // size
+        # 幅・高さ0の矩形も1セルとして扱う
+        right = max(rect.left, rect.right - 1) // size
+        bottom = max(rect.top, rect.bottom - 1) // size
+        return left, top, right, bottom
+
+    def build(self, rects):
+        """矩形リストからグリッドを再構築"""
+        self.rects = rects
+        cells = {}
+        for index, rect in enumerate(rects):
+            left, top, right, bottom = self._cell_range(rect)
+            for cx in range(left, right + 1):
+                for cy in range(top, bottom + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is None:
+                        cells[(cx, cy)] = [index]
+                    else:
+                        cell.append(index)
+        self.cells = cells
+
+    def query(self, rect):
+        """rectと衝突する矩形のインデックスを登録順で返す"""
+        cells = self.cells
+        rects = self.rects
+        left, top, right, bottom = self._cell_range(rect)
+
+        if left == right and top == bottom:
+            # 1セルに収まる場合（弾のほとんど）は重複がない
+            candidates = cells.get((left, top))
+            if not candidates:
+                return []
+            return [index for index in candidates if rect.colliderect(rects[index])]
+
+        hits = set()
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                candidates = cells.get((cx, cy))
+                if candidates:
+                    for index in candidates:
+                        if index not in hits and rect.colliderect(rects[index]):
+                            hits.add(index)
+        return sorted(hits)
+
+
+class SortAndSweepBroadphase:
+    """x座標でソートし、二分探索でx方向に重なる範囲だけを判定"""
+    def __init__(self):
+        self.rects = []
+        self.order = []
+        self.lefts = []
+        self.max_width = 0
+
+    def build(self, rects):
+        """矩形リストをleft順に並べて登録"""
+        self.rects = rects
+        boxes = [_normalized(rect) for rect in rects]
+        self.order = sorted(range(len(rects)), key=lambda index: boxes[index].left)
+        self.lefts = [boxes[index].left for index in self.order]
+        self.max_width = max((box.width for box in boxes), default=0)
+
+    def query(self, rect):
+        """rectと衝突する矩形のインデックスを登録順で返す"""
+        # other.left > rect.left - max_width かつ other.left < rect.right の範囲が候補
+        box = _normalized(rect)
+        start = bisect_right(self.lefts, box.left - self.max_width)
+        end = bisect_left(self.lefts, box.right)
+        rects = self.rects
+        hits = [index for index in self.order[start:end] if rect.colliderect(rects[index])]
+        hits.sort()
+        return hits
+
+
+class RectListBroadphase:
+    """pygameのRect.collidelistallで判定（ループはC側で行われる）"""
+    def __init__(self):
+        self.rects = []
+
+    def build(self, rects):
+        """矩形リストを登録"""
+        self.rects = rects
+
+    def query(self, rect):
+        """rectと衝突する矩形のインデックスを登録順で返す"""
+        return rect.collidelistall(self.rects)
+
+
+# 実行時に選択できるブロードフェーズ
+COLLISION_BACKENDS = {
+    'brute': BruteForceBroadphase,
+    'grid': SpatialHashGrid,
+    'sweep': SortAndSweepBroadphase,
+    'rectlist': RectListBroadphase,
+}
+
+def create_broadphase(name=COLLISION_BACKEND):
+    """名前からブロードフェーズを生成"""
+    if name not in COLLISION_BACKENDS:
+        raise ValueError(f"未知の当たり判定バックエンド: {name} (選択肢: {', '.join(COLLISION_BACKENDS)})")
+    return COLLISION_BACKENDS[name]()
+
+
+
+def round_hit(target, rect):
+    """rectに内接する円がtargetの矩形に当たっているか（最近点との二乗距離で判定）"""
+    radius = rect.width / 2
+    cx = rect.left + radius
+    cy = rect.top + rect.height / 2
+    nearest_x = min(max(cx, target.left), target.right)
+    nearest_y = min(max(cy, target.top), target.bottom)
+    dx = cx - nearest_x
+    dy = cy - nearest_y
+    return dx * dx + dy * dy < radius * radius
+
+def hazard_hits(target, rects, round_flags):
+    """複数の危険物がtargetに当たっているかをまとめて判定し、boolのリストを返す
+
+    round_flagsがTrueの要素はrectに内接する円（round_hitと同じ）、それ以外は矩形
+    （colliderectと同じく幅・高さ0は当たらない）で判定する。
+    """
+    if not NUMPY_AVAILABLE:
+        return [round_hit(target, rect) if round_shape else target.colliderect(rect)
+                for rect, round_shape in zip(rects, round_flags)]
+    if not rects:
+        return []
+
+    data = np.array([(rect.left, rect.top, rect.right, rect.bottom) for rect in rects], dtype=np.float64)
+    left, top, right, bottom = data.T
+
+    # 円形: 中心からtargetの最近点までの二乗距離 < 半径の二乗
+    radius = (right - left) * 0.5
+    cx = left + radius
+    cy = (top + bottom) * 0.5
+    dx = cx - np.clip(cx, target.left, target.right)
+    dy = cy - np.clip(cy, target.top, target.bottom)
+    circle_hit = dx * dx + dy * dy < radius * radius
+
+    # 矩形: colliderectと同じく負の幅・高さは反転させ、幅・高さ0の矩形は当たらない
+    box_left = np.minimum(left, right)
+    box_right = np.maximum(left, right)
+    box_top = np.minimum(top, bottom)
+    box_bottom = np.maximum(top, bottom)
+    box = _normalized(target)
+    box_hit = ((box_left < box.right) & (box.left < box_right) &
+               (box_top < box.bottom) & (box.top < box_bottom) &
+               (box_right > box_left) & (box_bottom > box_top))
+    if box.width == 0 or box.height == 0:
+        box_hit[:] = False
+
+    return np.where(np.array(round_flags, dtype=bool), circle_hit, box_hit).tolist()
+
+
+def _segment_enters_box(x0, y0, dx, dy, left, top, right, bottom):
+    """点(x0,y0)から(dx,dy)だけ動く線分が開区間の矩形内を通過するか（スラブ法）"""
+    t_enter = 0.0
+    t_exit = 1.0
+    for start, delta, low, high in ((x0, dx, left, right), (y0, dy, top, bottom)):
+        if delta == 0:
+            if not low < start < high:
+                return False
+            continue
+        t0 = (low - start) / delta
+        t1 = (high - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > t_enter:
+            t_enter = t0
+        if t1 < t_exit:
+            t_exit = t1
+        if t_enter >= t_exit:
+            return False
+    return True
+
+def _segment_point_distance_sq(x0, y0, dx, dy, px, py):
+    """線分と点の距離の二乗"""
+    length_sq = dx * dx + dy * dy
+    t = 0.0
+    if length_sq > 0:
+        t = min(1.0, max(0.0, ((px - x0) * dx + (py - y0) * dy) / length_sq))
+    ex = x0 + dx * t - px
+    ey = y0 + dy * t - py
+    return ex * ex + ey * ey
+
+def swept_box_hit(rect, dx, dy, target):
+    """前フレームから(dx,dy)移動してrectに来た矩形が、移動中にtargetに触れたか"""
+    if not rect.width or not rect.height or not target.width or not target.height:
+        return False
+    # targetを移動矩形の大きさだけ広げ、左上の点の移動経路で判定する
+    return _segment_enters_box(rect.left - dx, rect.top - dy, dx, dy,
+                               target.left - rect.width, target.top - rect.height,
+                               target.right, target.bottom)
+
+def swept_round_hit(rect, dx, dy, target):
+    """前フレームから(dx,dy)移動した円（rectに内接）が、移動中にtargetに触れたか"""
+    radius = rect.width / 2
+    if radius <= 0:
+        return False
+    x0 = rect.left + radius - dx
+    y0 = rect.top + rect.height / 2 - dy
+    # targetを半径だけ角丸に広げた図形と中心の移動経路の交差判定
+    if _segment_enters_box(x0, y0, dx, dy, target.left - radius, target.top, target.right + radius, target.bottom):
+        return True
+    if _segment_enters_box(x0, y0, dx, dy, target.left, target.top - radius, target.right, target.bottom + radius):
+        return True
+    radius_sq = radius * radius
+    for corner_x, corner_y in ((target.left, target.top), (target.right, target.top),
+                               (target.left, target.bottom), (target.right, target.bottom)):
+        if _segment_point_distance_sq(x0, y0, dx, dy, corner_x, corner_y) < radius_sq:
+            return True
+    return False
+
+def get_motion(obj):
+    """高速な弾の前フレームからの移動量を返す（連続判定が不要ならNone）"""
+    if not obj.swept_collision:
+        return None
+    dx = obj.x - obj.prev_x
+    dy = obj.y - obj.prev_y
+    if dx * dx + dy * dy < CCD_SPEED_THRESHOLD * CCD_SPEED_THRESHOLD:
+        return None
+    return dx, dy
+
+def get_swept_rect(rect, motion):
+    """移動前後の矩形を囲む矩形"""
+    dx, dy = motion
+    return rect.union(rect.move(-round(dx), -round(dy)))
+
+
+class VerticalBandIndex(SortAndSweepBroadphase):
+    """縦長の帯（ビーム）での問い合わせ用に、要素をx座標順に並べたインデックス
+
+    矩形はSortAndSweepBroadphaseのbuild/query、点（弾の中心）はbuild_points/query_pointsで扱う。
+    どちらも2回の二分探索でx方向の候補を絞り込み、登録順で結果を返す。
+    """
+    def __init__(self):
+        super().__init__()
+        self.points = []
+        self.point_order = []
+        self.point_keys = []
+
+    def build_points(self, points):
+        """点(x, y)のリストをx順に並べて登録"""
+        self.points = points
+        self.point_order = sorted(range(len(points)), key=lambda index: points[index][0])
+        self.point_keys = [points[index][0] for index in self.point_order]
+
+    def query_points(self, x0, x1, y0, y1):
+        """帯 [x0, x1] × [y0, y1]（境界を含む）に入る点のインデックスを登録順で返す"""
+        start = bisect_left(self.point_keys, x0)
+        end = bisect_right(self.point_keys, x1)
+        points = self.points
+        hits = [index for index in self.point_order[start:end] if y0 <= points[index][1] <= y1]
+        hits.sort()
+        return hits
+
+
+def _get_cached_mask(cache, key, create):
+    """LRUのマスクキャッシュから取得（なければcreate()で作成し、上限を超えたら最も古いものを破棄）"""
+    mask = cache.get(key)
+    if mask is not None:
+        cache.move_to_end(key)
+        return mask
+    mask = create()
+    cache[key] = mask
+    if len(cache) > MASK_CACHE_SIZE:
+        cache.popitem(last=False)
+    return mask
+
+def get_sprite_mask(image, size):
+    """画像をsizeに拡大縮小したときのマスクを取得（(画像, サイズ)ごとにキャッシュ）"""
+    return _get_cached_mask(_sprite_masks, (image, size),
+                            lambda: pygame.mask.from_surface(pygame.transform.scale(image, size)))
+
+def mask_hit(rect, mask, mask_rect):
+    """rectがmask_rectの位置に置いたマスクの不透明ピクセルに触れているか"""
+    # 先に矩形同士の重なりに絞ってから、その範囲だけピクセルを調べる
+    clip = rect.clip(mask_rect)
+    if not clip.width or not clip.height:
+        return False
+    # マスタースパークやレーザーは幅が毎フレーム変わるので、切り取ったサイズごとのマスクは上限付きで持つ
+    filled = _get_cached_mask(_filled_masks, clip.size, lambda: pygame.mask.Mask(clip.size, fill=True))
+    return mask.overlap(filled, (clip.x - mask_rect.x, clip.y - mask_rect.y)) is not None
+
+
+class CollisionWorld:
+    """レイヤーとマスクによる当たり判定
+
+    判定される側（targets）を1つのブロードフェーズに登録し、判定する側（sources）が
+    1回ずつ問い合わせて、マスクに一致した接触を(sourceレイヤー, targetレイヤー)ごとの
+    リストにまとめる。各リストはsourceの順、同じsource内ではtargetの順に並ぶ。
+    round_hitboxがTrueのtargetは円形、それ以外は矩形で判定する。
+    プレイヤーと低速の危険物（HAZARD_LAYERS）の判定は、フレーム内の低速な危険物すべてを
+    hazard_hitsで1回にまとめて行う（ボスの弾の多くと壁がこちら、高速な弾は連続判定）。
+    CCD_SPEED_THRESHOLD以上で動く弾は前フレームからの移動経路で判定する（すり抜け防止）。
+    band_queryがTrueのsource（レーザー・必殺技などの縦長の帯）は縦帯インデックスで問い合わせる。
+    PIXEL_PERFECT_COLLISIONが有効なら、プレイヤーの弾（LAYER_PLAYER_BULLET）に対してだけ、
+    mask_collisionがTrueのtarget（画像のある敵）を矩形で当たった後に画像のマスクでも判定する
+    （プレイヤーの体当たりや必殺技などは矩形のまま）。
+    """
+    def __init__(self, backend=COLLISION_BACKEND):
+        self.set_backend(backend)
+        self.band_index = VerticalBandIndex()
+        self.targets = []
+
+    def set_backend(self, name):
+        """ブロードフェーズを切り替え"""
+        self.broadphase = create_broadphase(name)
+        self.backend = name
+
+    def collect_contacts(self, sources, targets):
+        """接触リストを作成して {(sourceレイヤー, targetレイヤー): [(source, target), ...]} で返す"""
+        # 高速な弾は移動前後を囲む矩形でブロードフェーズに登録する
+        target_motions = [get_motion(target) for target in targets]
+        target_rects = [
+            target.rect if motion is None else get_swept_rect(target.rect, motion)
+            for target, motion in zip(targets, target_motions)
+        ]
+        self.broadphase.build(target_rects)
+        self.targets = targets
+        # 低速な危険物はプレイヤーとまとめて判定するので、候補をフレームごとに一度だけ集める
+        slow_hazards = [index for index, (target, motion) in enumerate(zip(targets, target_motions))
+                        if motion is None and target.collision_layer & HAZARD_LAYERS]
+        band_built = False
+        contacts = {}
+        for source in sources:
+            mask = source.collision_mask
+            if not mask:
+                continue
+            source_rect = source.rect
+            source_layer = source.collision_layer
+            source_motion = get_motion(source)
+            query_rect = source_rect if source_motion is None else get_swept_rect(source_rect, source_motion)
+            if source.band_query:
+                # 縦帯インデックスは帯のsourceが現れたときだけ作る
+                if not band_built:
+                    self.band_index.build(target_rects)
+                    band_built = True
+                candidates = self.band_index.query(query_rect)
+            else:
+                candidates = self.broadphase.query(query_rect)
+            hazard_results = None
+            if source_layer == LAYER_PLAYER and source_motion is None:
+                hazard_results = self._hazard_narrowphase(source_rect, slow_hazards)
+            for index in candidates:
+                target = targets[index]
+                target_layer = target.collision_layer
+                if not target_layer & mask:
+                    continue
+                target_motion = target_motions[index]
+                if source_motion is None and target_motion is None:
+                    # 低速同士は離散判定（矩形はブロードフェーズで判定済み）
+                    if hazard_results is not None and target_layer & HAZARD_LAYERS:
+                        if index not in hazard_results:
+                            continue
+                    elif target.round_hitbox and not round_hit(source_rect, target.rect):
+                        continue
+                else:
+                    # どちらかが高速なら相対移動の経路で判定
+                    sdx, sdy = source_motion or (0, 0)
+                    tdx, tdy = target_motion or (0, 0)
+                    if target.round_hitbox:
+                        hit = swept_round_hit(target.rect, tdx - sdx, tdy - sdy, source_rect)
+                    else:
+                        hit = swept_box_hit(source_rect, sdx - tdx, sdy - tdy, target.rect)
+                    if not hit:
+                        continue
+                if PIXEL_PERFECT_COLLISION and source_layer == LAYER_PLAYER_BULLET and target.mask_collision:
+                    sprite_mask = target.get_collision_mask()
+                    if sprite_mask is not None and not mask_hit(query_rect, *sprite_mask):
+                        continue
+                pair = (source_layer, target_layer)
+                pair_contacts = contacts.get(pair)
+                if pair_contacts is None:
+                    contacts[pair] = [(source, target)]
+                else:
+                    pair_contacts.append((source, target))
+        return contacts
+
+    def _hazard_narrowphase(self, source_rect, indices):
+        """低速な危険物（indices）をまとめて判定し、当たったもののインデックスの集合を返す"""
+        targets = self.targets
+        hits = hazard_hits(source_rect, [targets[index].rect for index in indices],
+                           [targets[index].round_hitbox for index in indices])
+        return {index for index, hit in zip(indices, hits) if hit}
+
+    def query_radius(self, x, y, radius, layer_mask):
+        """中心(x, y)から半径radius以内（境界を含む）に中心があるtargetを登録順で返す
+
+        collect_contactsで作ったブロードフェーズをそのまま使い、二乗距離で判定する。
+        """
+        reach = int(radius) + 1
+        bounds = pygame.Rect(int(x) - reach, int(y) - reach, reach * 2 + 1, reach * 2 + 1)
+        radius_sq = radius * radius
+        hits = []
+        for index in self.broadphase.query(bounds):
+            target = self.targets[index]
+            if not target.collision_layer & layer_mask:
+                continue
+            dx = target.x - x
+            dy = target.y - y
+            if dx * dx + dy * dy <= radius_sq:
+                hits.append(target)
+        return hits
@@ -1,15 +1,57 @@
 import pygame
 from settings import *
 
+# (フォント, 色) -> {文字: 描画済みSurface}
+_glyph_atlases = {}
+DAMAGE_GLYPHS = "0123456789.-KM"
+
+
+def format_damage(damage):
+    """ダメージ値を短い文字列にする（整数はそのまま、小数は丸め、1000以上はK/M表記）"""
+    # 先に表示する桁（小数点以下1桁）に丸めてから判定する（9.96などが"10.0"にならないように）
+    value = round(float(damage), 1)
+    if abs(value) >= 10:
+        value = round(value)  # 2桁以上は整数に丸める
+    for limit, suffix in ((1000000, "M"), (1000, "K")):
+        # 1つ下の単位で丸めると1000以上になる値も繰り上げる（999999が"1000K"にならないように）
+        if abs(round(value * 1000 / limit, 1)) >= 1000:
+            return f"{value / limit:.1f}".rstrip("0").rstrip(".") + suffix
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.1f}"  # 1桁の小数は小数点以下1桁まで
+
+def get_glyph_atlas(font, color):
+    """数字などの文字をフォント・色ごとに一度だけ描画したアトラスを取得"""
+    key = (font, tuple(color))
+    atlas = _glyph_atlases.get(key)
+    if atlas is None:
+        atlas = {char: font.render(char, True, color) for char in DAMAGE_GLYPHS}
+        _glyph_atlases[key] = atlas
+    return atlas
+
+def render_damage_text(font, color, text):
+    """アトラスの文字を並べて数値の画像を作成"""
+    glyphs = [get_glyph_atlas(font, color)[char] for char in text]
+    width = sum(glyph.get_width() for glyph in glyphs)
+    height = max((glyph.get_height() for glyph in glyphs), default=0)
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    x = 0
+    for glyph in glyphs:
+        surface.blit(glyph, (x, 0))
+        x += glyph.get_width()
+    return surface
+
 class DamageNumber:
     """ダメージ数値を表示するためのクラス"""
     def __init__(self, x, y, damage, font, color=WHITE):
         self.x = x
         self.y = y
-        self.damage = str(damage)
+        self.damage = format_damage(damage)
         self.font = font
         self.color = color
-        
+        # アトラスの文字は全ての数値で共有しているので、透明度は数値ごとの画像に設定する
+        self.surface = render_damage_text(font, color, self.damage)
+
         # ライフサイクルと動き
         self.lifetime = 60  # 60フレーム（1秒）で消える
         self.speed_y = -1   # 上昇速度
@@ -20,20 +62,20 @@ class DamageNumber:
         """位置と透明度を更新"""
         self.y += self.speed_y
         self.lifetime -= 1
-        
+
         # 徐々に透明にする
         if self.lifetime < 30:
             self.alpha = max(0, int(255 * (self.lifetime / 30)))
-            
+
         if self.lifetime <= 0:
             self.active = False
 
     def draw(self, screen):
-        """ダメージ数値を描画"""
+        """ダメージ数値を描画（アトラスから作った自分専用の画像に透明度を設定）"""
         if not self.active:
             return
-            
-        text_surface = self.font.render(self.damage, True, self.color)
-        text_surface.set_alpha(self.alpha)
-        text_rect = text_surface.get_rect(center=(self.x, self.y))
-        screen.blit(text_surface, text_rect)
\ No newline at end of file
+
+        self.surface.set_alpha(self.alpha)
+        x = int(self.x) - self.surface.get_width() // 2
+        y = int(self.y) - self.font.get_height() // 2
+        screen.blit(self.surface, (x, y))
@@ -0,0 +1,47 @@
+import pygame
+from settings import *
+
+# 名前 -> 描画関数(radius, alpha, *params) -> Surface
+_effect_renderers = {}
+# (名前, 半径, 段階に丸めたアルファ, params) -> 描画済みSurface
+_effect_frames = {}
+
+
+def register_effect(name, render_func):
+    """sin()などで半径・透明度が変わる演出を登録（render_func(radius, alpha, *params)は直径サイズのSurfaceを返す）"""
+    _effect_renderers[name] = render_func
+
+def quantize_alpha(alpha):
+    """アルファ値をEFFECT_ALPHA_STEP刻みに丸める"""
+    return min(255, max(0, round(alpha / EFFECT_ALPHA_STEP) * EFFECT_ALPHA_STEP))
+
+def get_effect_frame(name, radius, alpha, *params):
+    """登録済み演出の(半径, アルファ)の1コマを取得（初回だけ描画）"""
+    radius = int(radius)
+    alpha = quantize_alpha(alpha)
+    key = (name, radius, alpha, params)
+    frame = _effect_frames.get(key)
+    if frame is None:
+        frame = _effect_renderers[name](radius, alpha, *params)
+        _effect_frames[key] = frame
+    return frame
+
+def draw_effect(screen, name, center, radius, alpha, *params):
+    """登録済み演出をcenterを中心に描画"""
+    if int(radius) <= 0:
+        return
+    frame = get_effect_frame(name, radius, alpha, *params)
+    screen.blit(frame, (center[0] - int(radius), center[1] - int(radius)))
+
+def _render_circle(radius, alpha, color):
+    """半透明の塗りつぶし円"""
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (*color[:3], alpha), (radius, radius), radius)
+    return surface
+
+register_effect("circle", _render_circle)
+
+def get_effect_stats_text():
+    """パフォーマンス表示用の文字列"""
+    memory = sum(s.get_bytesize() * s.get_width() * s.get_height() for s in _effect_frames.values())
+    return f"Effects: {len(_effect_renderers)} kinds {len(_effect_frames)} frames {memory / 1024:.0f}KB"
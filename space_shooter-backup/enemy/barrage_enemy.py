@@ -4,6 +4,8 @@ import random
 from enemy.enemy_base import Enemy
 from bullet import Bullet
 from settings import *
+from asset_manager import assets
+from effect_cache import draw_effect
 
 class BarrageEnemy(Enemy):
     """弾幕を放つ特殊な敵"""
@@ -12,10 +14,7 @@ class BarrageEnemy(Enemy):
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            import os
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'barrage.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('barrage.png')
 
     def __init__(self, x, y, player, level_multipliers=None, game=None):
         self.load_image()
@@ -87,7 +86,7 @@ class BarrageEnemy(Enemy):
     def draw(self, screen):
         """barrage.png画像で描画"""
         if self.image:
-            img = pygame.transform.scale(self.image, (int(self.size), int(self.size)))
+            img = self.get_sprite()
             rect = img.get_rect(center=(self.x, self.y))
             screen.blit(img, rect)
         else:
@@ -101,8 +100,6 @@ class BarrageEnemy(Enemy):
             charge_ratio = (60 - self.barrage_timer) / 60.0
             radius = int((self.size//2) * charge_ratio)
             alpha = int(150 * charge_ratio)
-            surface = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(surface, (*WHITE[:3], alpha), (radius, radius), radius)
-            screen.blit(surface, (self.x - radius, self.y - radius))
+            draw_effect(screen, "circle", (self.x, self.y), radius, alpha, WHITE[:3])
         if hasattr(self, 'draw_health_bar'):
             self.draw_health_bar(screen)
\ No newline at end of file
@@ -1,6 +1,7 @@
 import pygame
 from enemy.enemy_base import Enemy
 from settings import *
+from asset_manager import assets
 
 class BasicEnemy(Enemy):
     """基本的な敵"""
@@ -9,10 +10,7 @@ class BasicEnemy(Enemy):
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            import os
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'basic.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('basic.png')
 
     def __init__(self, x, y, player, level_multipliers=None, game=None):
         self.load_image()
@@ -30,7 +28,7 @@ class BasicEnemy(Enemy):
     def draw(self, screen):
         """basic.png画像で描画"""
         if self.image:
-            img = pygame.transform.scale(self.image, (self.size, self.size))
+            img = self.get_sprite()
             rect = img.get_rect(center=(self.x, self.y))
             screen.blit(img, rect)
         else:
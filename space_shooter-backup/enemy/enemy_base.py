@@ -3,9 +3,19 @@ import random
 import math
 from settings import *
 from bullet import Bullet
+from collision import get_sprite_mask
+from sprite_cache import get_scaled_sprite, sprite_cache
 
 class Enemy(pygame.sprite.Sprite):
     """敵の基底クラス"""
+    # 当たり判定の設定
+    collision_layer = LAYER_ENEMY
+    collision_mask = 0
+    round_hitbox = False
+    swept_collision = False
+    mask_collision = True  # 画像がある場合はピクセル単位でも判定
+    image = None  # 画像を使う敵はサブクラスでロードする
+
     def __init__(self, x, y, player, health=1, speed=ENEMY_SPEED, color=RED, size=ENEMY_SIZE, game=None):
         super().__init__()
         self.x = x
@@ -75,6 +85,29 @@ class Enemy(pygame.sprite.Sprite):
         # 体力バーの描画
         self.draw_health_bar(screen)
 
+    def is_flashing(self):
+        """被弾フラッシュ中かどうか"""
+        return self.game is not None and self in self.game.hit_flashes
+
+    def get_sprite(self):
+        """現在のサイズ・被弾状態に合わせた画像をキャッシュから取得"""
+        size = (int(self.size), int(self.size))
+        return get_scaled_sprite(self.image, size, HIT_FLASH_TINT if self.is_flashing() else None)
+
+    def prewarm_sprites(self):
+        """出現時に描画用の画像を先に用意しておく"""
+        if self.image is not None:
+            sprite_cache.prewarm(self.image, (int(self.size), int(self.size)))
+
+    def get_collision_mask(self):
+        """描画される画像のマスクと配置矩形を取得（画像がない場合はNone）"""
+        if self.image is None:
+            return None
+        size = (int(self.size), int(self.size))
+        sprite_rect = pygame.Rect((0, 0), size)
+        sprite_rect.center = (self.x, self.y)
+        return get_sprite_mask(self.image, size), sprite_rect
+
     def draw_outline(self, screen, color, width):
         """敵のアウトラインを描画"""
         pygame.draw.rect(screen, color, self.rect, width)
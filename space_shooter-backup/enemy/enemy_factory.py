@@ -39,7 +39,9 @@ class EnemyFactory:
         
         enemy_class = cls.ENEMY_CLASSES.get(enemy_type, BasicEnemy)
         
-        return enemy_class(x, y, player, level_multipliers=level_multipliers, game=game, **kwargs)
+        enemy = enemy_class(x, y, player, level_multipliers=level_multipliers, game=game, **kwargs)
+        enemy.prewarm_sprites()
+        return enemy
     
     @classmethod
     def create_random_enemy(cls, x, y, player, level_config=None, game=None):
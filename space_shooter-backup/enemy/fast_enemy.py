@@ -1,7 +1,7 @@
 import pygame
 from enemy.enemy_base import Enemy
 from settings import *
-import os
+from asset_manager import assets
 
 class FastEnemy(Enemy):
     """高速敵"""
@@ -10,9 +10,7 @@ class FastEnemy(Enemy):
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'fast.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('fast.png')
 
     def __init__(self, x, y, player, level_multipliers=None, game=None):
         self.load_image()
@@ -34,7 +32,7 @@ class FastEnemy(Enemy):
     def draw(self, screen):
         """fast.png画像で描画"""
         if self.image:
-            img = pygame.transform.scale(self.image, (self.size, self.size))
+            img = self.get_sprite()
             rect = img.get_rect(center=(self.x, self.y))
             screen.blit(img, rect)
         else:
@@ -2,6 +2,7 @@ import pygame
 import math
 from enemy.enemy_base import Enemy
 from settings import *
+from asset_manager import assets
 
 class KamikazeEnemy(Enemy):
     """カミカゼ敵 - プレイヤーに向かって突進"""
@@ -10,10 +11,7 @@ class KamikazeEnemy(Enemy):
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            import os
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'kamikaze.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('kamikaze.png')
 
     def __init__(self, x, y, player, level_multipliers=None, game=None):
         self.load_image()
@@ -57,7 +55,7 @@ class KamikazeEnemy(Enemy):
     def draw(self, screen):
         """kamikaze.png画像で描画"""
         if self.image:
-            img = pygame.transform.scale(self.image, (self.size, self.size))
+            img = self.get_sprite()
             rect = img.get_rect(center=(self.x, self.y))
             screen.blit(img, rect)
         else:
@@ -2,7 +2,7 @@ import pygame
 import math
 from enemy.enemy_base import Enemy
 from settings import *
-import os
+from asset_manager import assets
 
 class ShieldEnemy(Enemy):
     """シールド敵 - 一定ダメージまで無敵"""
@@ -11,9 +11,7 @@ class ShieldEnemy(Enemy):
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'shield.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('shield.png')
 
     def __init__(self, x, y, player, level_multipliers=None, game=None):
         self.load_image()
@@ -46,7 +44,7 @@ class ShieldEnemy(Enemy):
     def draw(self, screen):
         """shield.png画像で描画し、シールドエフェクトや目も重ねる"""
         if self.image:
-            img = pygame.transform.scale(self.image, (self.size, self.size))
+            img = self.get_sprite()
             rect = img.get_rect(center=(self.x, self.y))
             screen.blit(img, rect)
         else:
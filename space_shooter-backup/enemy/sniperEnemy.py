@@ -3,6 +3,8 @@ import math
 from enemy.enemy_base import Enemy, TargetedBullet
 from bullet import Bullet
 from settings import *
+from asset_manager import assets
+from rotation_cache import get_polygon_sprite
 
 class SniperEnemy(Enemy):
     """スナイパー敵 - 止まってプレイヤーを狙い撃ち"""
@@ -11,10 +13,7 @@ class SniperEnemy(Enemy):
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            import os
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'sniper.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('sniper.png')
 
     def __init__(self, x, y, player, level_multipliers=None, game=None):
         self.load_image()
@@ -56,19 +55,13 @@ class SniperEnemy(Enemy):
     def draw(self, screen):
         """sniper.png画像で描画"""
         if self.image:
-            img = pygame.transform.scale(self.image, (self.size, self.size))
+            img = self.get_sprite()
             rect = img.get_rect(center=(self.x, self.y))
             screen.blit(img, rect)
         else:
             # 画像がロードできなかった場合は六角形で描画
-            points = []
-            for i in range(6):
-                angle = i * 60 * math.pi / 180
-                px = self.x + (self.size//2) * math.cos(angle)
-                py = self.y + (self.size//2) * math.sin(angle)
-                points.append((px, py))
-            pygame.draw.polygon(screen, self.color, points)
-            pygame.draw.polygon(screen, self.outline_color, points, 2)
+            surface, offset = get_polygon_sprite(6, self.size//2, self.color, outline_color=self.outline_color)
+            screen.blit(surface, (int(self.x) - offset, int(self.y) - offset))
             pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), 3)
             pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), 6, 1)
         # 体力バー
@@ -3,6 +3,7 @@ import math
 import random
 from enemy.enemy_base import Enemy
 from settings import *
+from rotation_cache import get_polygon_sprite
 
 class StopperEnemy(Enemy):
     """ストッパー敵 - 画面中央で一時停止して集中攻撃"""
@@ -60,19 +61,12 @@ class StopperEnemy(Enemy):
     
     def draw(self, screen):
         """ストッパー敵は八角形で描画"""
-        # 八角形の頂点を計算
-        points = []
-        for i in range(8):
-            angle = i * 45 * math.pi / 180
-            px = self.x + (self.size//2) * math.cos(angle)
-            py = self.y + (self.size//2) * math.sin(angle)
-            points.append((px, py))
-        
         # 停止中は色を変える
         color = (255, 255, 100) if self.state == "stopping" else self.color
         
-        pygame.draw.polygon(screen, color, points)
-        pygame.draw.polygon(screen, self.outline_color, points, 2)
+        # 八角形は事前描画したものを使う
+        surface, offset = get_polygon_sprite(8, self.size//2, color, outline_color=self.outline_color)
+        screen.blit(surface, (int(self.x) - offset, int(self.y) - offset))
         
         # 停止中は警告マーク
         if self.state == "stopping":
@@ -2,6 +2,7 @@ import pygame
 import random
 from enemy.enemy_base import Enemy
 from settings import *
+from asset_manager import assets
 
 class TankEnemy(Enemy):
     """タンク敵 - 大きくて遅い、体力が多い、連射してくる"""
@@ -10,10 +11,7 @@ class TankEnemy(Enemy):
     @classmethod
     def load_image(cls):
         if cls.image is None:
-            import os
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            img_path = os.path.join(base_dir, 'assets', 'img', 'tank.png')
-            cls.image = pygame.image.load(img_path).convert_alpha()
+            cls.image = assets.get('tank.png')
 
     def __init__(self, x, y, player, level_multipliers=None, game=None):
         self.load_image()
@@ -51,7 +49,7 @@ class TankEnemy(Enemy):
     def draw(self, screen):
         """tank.png画像で描画"""
         if self.image:
-            img = pygame.transform.scale(self.image, (self.size, self.size))
+            img = self.get_sprite()
             rect = img.get_rect(center=(self.x, self.y))
             screen.blit(img, rect)
         else:
@@ -0,0 +1,34 @@
+import os
+
+import pygame
+from settings import *
+
+DEFAULT_FONT_PATH = os.path.join(os.path.dirname(__file__), "NotoSansJP-VariableFont_wght.ttf")
+
+
+class FontRegistry:
+    """フォントを(パス, サイズ)ごとに一度だけ読み込んで共有する"""
+    def __init__(self):
+        self.fonts = {}  # (パス, サイズ) -> Font
+
+    def get(self, path, size):
+        """フォントを取得（pathがNoneならpygame標準フォント）"""
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.Font(path, size)
+            except Exception as e:
+                print(f"Error loading font {path}: {e}")
+                # フォントの初期化に失敗した場合はエラーを発生させる
+                raise
+            self.fonts[key] = font
+        return font
+
+
+# ゲーム全体で共有するフォント
+fonts = FontRegistry()
+
+def get_font(size, path=DEFAULT_FONT_PATH):
+    """共有フォントを取得（既定は日本語フォント）"""
+    return fonts.get(path, size)
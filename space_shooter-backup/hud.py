@@ -0,0 +1,89 @@
+import pygame
+from settings import *
+
+
+class HudWidget:
+    """HUDの部品（keyが変わったときだけdraw_funcで描き直す）"""
+    def __init__(self, name, key_func, draw_func):
+        self.name = name
+        self.key_func = key_func
+        self.draw_func = draw_func
+        self.key = None
+        self.rect = None  # レイヤー上で最後に描いた範囲
+        self.dirty = True
+
+
+class HudLayer:
+    """HUDを描いておく常駐レイヤー（値が変わった部品の範囲だけ描き直す）"""
+    def __init__(self):
+        self.widgets = []
+        self.surface = None
+        self.scratch = None  # 部品を1つずつ描いて範囲を調べるための作業用Surface
+        self.redraw_count = 0
+        self.last_dirty_rects = []
+
+    def add_widget(self, name, key_func, draw_func):
+        """部品を登録（key_funcの戻り値が前回と違うフレームだけ描き直す）"""
+        self.widgets.append(HudWidget(name, key_func, draw_func))
+
+    def resize(self, size):
+        """画面サイズに合わせてレイヤーを作り直し、全部品を描き直す"""
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.scratch = pygame.Surface(size, pygame.SRCALPHA)
+        for widget in self.widgets:
+            widget.rect = None
+            widget.dirty = True
+
+    def update(self):
+        """値が変わった部品を描き直し、変化した範囲のリストを返す"""
+        for widget in self.widgets:
+            key = widget.key_func()
+            if key != widget.key:
+                widget.key = key
+                widget.dirty = True
+
+        dirty_rects = []
+        for widget in self.widgets:
+            if widget.dirty:
+                if widget.rect:
+                    dirty_rects.append(widget.rect)
+                widget.rect = self._render_widget(widget)
+                if widget.rect:
+                    dirty_rects.append(widget.rect)
+                widget.dirty = False
+        if not dirty_rects:
+            self.last_dirty_rects = []
+            return dirty_rects
+
+        # 変化した範囲を消して、そこに掛かる部品をすべて描き直す（重なった部品も消えないように）
+        for rect in dirty_rects:
+            self.surface.fill((0, 0, 0, 0), rect)
+        for widget in self.widgets:
+            if widget.rect and widget.rect.collidelist(dirty_rects) != -1:
+                self.scratch.fill((0, 0, 0, 0))
+                widget.draw_func(self.scratch)
+                self.redraw_count += 1
+                for rect in dirty_rects:
+                    self.surface.blit(self.scratch, rect.topleft, rect)
+        self.last_dirty_rects = dirty_rects
+        return dirty_rects
+
+    def _render_widget(self, widget):
+        """部品を作業用Surfaceに描いて、実際に描かれた範囲を調べる"""
+        self.scratch.fill((0, 0, 0, 0))
+        widget.draw_func(self.scratch)
+        rect = self.scratch.get_bounding_rect()
+        return rect if rect.width and rect.height else None
+
+    def draw(self, screen):
+        """レイヤーを画面に転送（部品の範囲だけを1回のblitsで）"""
+        if self.surface is None or self.surface.get_size() != screen.get_size():
+            self.resize(screen.get_size())
+        self.update()
+        screen.blits([(self.surface, widget.rect.topleft, widget.rect) for widget in self.widgets if widget.rect],
+                     doreturn=False)
+
+    def get_stats_text(self):
+        """パフォーマンス表示用の文字列"""
+        dirty_pixels = sum(rect.width * rect.height for rect in self.last_dirty_rects)
+        return f"HUD: {len(self.widgets)} widgets, redraws {self.redraw_count}, dirty {len(self.last_dirty_rects)} rects {dirty_pixels}px"
@@ -3,6 +3,7 @@ from settings import *
 from utils import draw_text # draw_textをインポート
 
 from utils import draw_text_relative, draw_text_absolute # draw_textをインポート
+from overlay_cache import draw_overlay, draw_dim # 全画面オーバーレイのキャッシュ
 
 def draw_level_info(screen, level_system, font, small_font):
     """レベル情報を画面に描画"""
@@ -137,11 +138,8 @@ def draw_level_up_notification(screen, font, notification_timer):
         # 通知の透明度を時間に応じて変更
         alpha = min(255, notification_timer * 8)
         
-        # 背景を少し暗くする
-        overlay = pygame.Surface(screen.get_size())
-        overlay.set_alpha(alpha // 3)
-        overlay.fill(BLACK)
-        screen.blit(overlay, (0, 0))
+        # 背景を少し暗くする（透明度が毎フレーム変わるので黒いSurfaceだけを使い回す）
+        draw_dim(screen, alpha // 3)
         
         # レベルアップテキスト
         draw_text_relative(screen, "LEVEL UP!", 0.5, 0.45, font, YELLOW)
@@ -165,39 +163,38 @@ def draw_difficulty_info(screen, level_system, small_font):
 def draw_level_transition(screen, font, small_font, level_system, transition_timer):
     """レベル移行時の画面表示"""
     if transition_timer > 0:
-        # 背景を暗くする
-        overlay = pygame.Surface(screen.get_size())
-        overlay.set_alpha(150)
-        overlay.fill(BLACK)
-        screen.blit(overlay, (0, 0))
-        
         config = level_system.get_current_config()
-        
-        # レベル情報表示
-        draw_text_relative(screen, f"LEVEL {level_system.current_level}", 0.5, 0.4, font, CYAN)
-        
-        # レベル説明
-        draw_text_relative(screen, config['description'], 0.5, 0.45, small_font, WHITE)
-        
-        # 新要素の表示
-        new_feature_text = ""
-        if level_system.current_level == 2:
-            new_feature_text = "NEW: Tank Enemies - High HP, slow movement"
-        elif level_system.current_level == 3:
-            new_feature_text = "NEW: Zigzag Enemies - Unpredictable movement"
-        elif level_system.current_level == 4:
-            new_feature_text = "NEW: Sniper Enemies - Accurate shots"
-        elif level_system.current_level == 5:
-            new_feature_text = "NEW: Shield Enemies - Protected by barriers"
-        elif level_system.current_level == 6:
-            new_feature_text = "NEW: Stopper Enemies - Stop and attack"
-        else:
-            new_feature_text = "Difficulty Increased!"
-        
-        draw_text_relative(screen, new_feature_text, 0.5, 0.5, small_font, YELLOW)
-        
-        # 継続メッセージ
-        draw_text_relative(screen, "Press SPACE to continue", 0.5, 0.6, small_font, WHITE)
+        level = level_system.current_level
+
+        def draw_static(overlay):
+            # レベル情報表示
+            draw_text_relative(overlay, f"LEVEL {level}", 0.5, 0.4, font, CYAN)
+
+            # レベル説明
+            draw_text_relative(overlay, config['description'], 0.5, 0.45, small_font, WHITE)
+
+            # 新要素の表示
+            new_feature_text = ""
+            if level == 2:
+                new_feature_text = "NEW: Tank Enemies - High HP, slow movement"
+            elif level == 3:
+                new_feature_text = "NEW: Zigzag Enemies - Unpredictable movement"
+            elif level == 4:
+                new_feature_text = "NEW: Sniper Enemies - Accurate shots"
+            elif level == 5:
+                new_feature_text = "NEW: Shield Enemies - Protected by barriers"
+            elif level == 6:
+                new_feature_text = "NEW: Stopper Enemies - Stop and attack"
+            else:
+                new_feature_text = "Difficulty Increased!"
+
+            draw_text_relative(overlay, new_feature_text, 0.5, 0.5, small_font, YELLOW)
+
+            # 継続メッセージ
+            draw_text_relative(overlay, "Press SPACE to continue", 0.5, 0.6, small_font, WHITE)
+
+        # 背景を暗くするオーバーレイと文字はレベル・解像度ごとに一度だけ作る
+        draw_overlay(screen, "level_transition", 150, draw_static, (font, small_font, level, config['description']))
 
 def draw_stats_panel(screen, level_system, font, small_font):
     """統計パネルを表示（右上）"""
@@ -280,10 +277,8 @@ def draw_special_gauge(screen, player, font):
 
 def draw_stage_clear(screen, font):
     """ステージクリア画面を描画"""
-    overlay = pygame.Surface(screen.get_size())
-    overlay.set_alpha(150)
-    overlay.fill(BLACK)
-    screen.blit(overlay, (0, 0))
+    def draw_static(overlay):
+        draw_text_relative(overlay, "STAGE CLEAR", 0.5, 0.45, font, YELLOW)
+        draw_text_relative(overlay, "Click to Continue", 0.5, 0.55, font, WHITE)
 
-    draw_text_relative(screen, "STAGE CLEAR", 0.5, 0.45, font, YELLOW)
-    draw_text_relative(screen, "Click to Continue", 0.5, 0.55, font, WHITE)
\ No newline at end of file
+    draw_overlay(screen, "stage_clear", 150, draw_static, font)
\ No newline at end of file
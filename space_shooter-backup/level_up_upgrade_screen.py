@@ -5,6 +5,7 @@ import pygame
 import random
 from settings import *
 from utils import draw_text_multiline, draw_text_relative, draw_text_absolute
+from overlay_cache import draw_overlay
 
 LIGHT_BLUE = (173, 216, 230)
 
@@ -92,25 +93,27 @@ class LevelUpUpgradeScreen:
         if not self.is_active:
             return
 
-        # 半透明のオーバーレイ
-        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        # 選択中は内容が変わらないので、オーバーレイ・タイトル・カードをまとめて一度だけ描いておく
+        key = (self.font, self.small_font, tuple(map(tuple, self.choice_rects)),
+               tuple((upgrade.name, upgrade.description) for upgrade in self.current_choices))
+        draw_overlay(self.screen, "level_up_upgrade", 180, self.draw_static, key)
 
+    def draw_static(self, surface):
+        """タイトルと選択肢カードを描画（オーバーレイのキャッシュ作成時のみ）"""
         # タイトル
-        draw_text_relative(self.screen, "LEVEL UP! CHOOSE YOUR POWER", 0.5, 0.15, self.font, YELLOW)
+        draw_text_relative(surface, "LEVEL UP! CHOOSE YOUR POWER", 0.5, 0.15, self.font, YELLOW)
 
         # 各選択肢カードを描画
         for i, rect in enumerate(self.choice_rects):
             upgrade = self.current_choices[i]
             
             # カードの背景
-            pygame.draw.rect(self.screen, (30, 30, 80), rect, border_radius=10)
-            pygame.draw.rect(self.screen, LIGHT_BLUE, rect, 2, border_radius=10)
+            pygame.draw.rect(surface, (30, 30, 80), rect, border_radius=10)
+            pygame.draw.rect(surface, LIGHT_BLUE, rect, 2, border_radius=10)
             
             # アップグレード名
-            draw_text_absolute(self.screen, upgrade.name, rect.centerx, rect.y + 30, self.font, WHITE)
+            draw_text_absolute(surface, upgrade.name, rect.centerx, rect.y + 30, self.font, WHITE)
 
             # 説明文
             # draw_text_multilineはrectと絶対座標を直接受け取るため、そのまま使用
-            draw_text_multiline(self.screen, upgrade.description, self.small_font, WHITE, rect.inflate(-40, -40), rect.x + 20, rect.y + 120)
\ No newline at end of file
+            draw_text_multiline(surface, upgrade.description, self.small_font, WHITE, rect.inflate(-40, -40), rect.x + 20, rect.y + 120)
\ No newline at end of file
@@ -3,9 +3,11 @@ import random
 import sys
 import os # 追加
 import json # 追加
+import time
+import argparse
 from settings import *
 from player import Player
-from bullet import Bullet, Bomb, MasterSpark
+from bullet import Bullet, Bomb
 # from enemy import Enemy
 from enemy.enemy_factory import EnemyFactory
 from enemy.sniperEnemy import SniperEnemy
@@ -19,6 +21,17 @@ from boss.environmental_boss import EnvironmentalBoss
 from boss.boss_ui import draw_boss_health_bar, draw_boss_spell_card_name # 追加
 from level_up_upgrade_screen import LevelUpUpgradeScreen # レベルアップ時アップグレード画面
 from damage_number import DamageNumber # 追加
+import snapshot # ゲーム状態のスナップショット
+from rewind import RewindBuffer # 巻き戻し用リングバッファ
+from perf_overlay import PerfOverlay # パフォーマンス表示
+from collision import COLLISION_BACKENDS, CollisionWorld, VerticalBandIndex # 当たり判定
+from sprite_cache import sprite_cache # 拡大縮小済み画像のキャッシュ
+from asset_manager import assets # 画像アセットの一括管理
+from hud import HudLayer # HUDの常駐レイヤー
+from bullet_atlas import draw_bullets, get_atlas_stats_text # 弾の一括描画
+from rotation_cache import get_rotation_stats_text # 回転済み図形のキャッシュ
+from effect_cache import get_effect_stats_text # 明滅する演出のキャッシュ
+from overlay_cache import get_overlay_stats_text # 全画面オーバーレイのキャッシュ
 
 class Game:
     def __init__(self):
@@ -31,6 +44,9 @@ class Game:
         except Exception as e:
             print(f"pygame初期化エラー: {e}")
             sys.exit(1)
+
+        # 画像のデコードをワーカースレッドで先に始めておく（convertは表示モード設定後）
+        assets.preload()
         
         # デスクトップの解像度を取得
         try:
@@ -70,6 +86,9 @@ class Game:
         self.desktop_width = desktop_width
         self.desktop_height = desktop_height
         self.original_aspect_ratio = aspect_ratio  # 元のアスペクト比を保存
+
+        # パフォーマンス表示（F3で切り替え、set_screenが背景キャッシュの情報を登録するので先に作る）
+        self.perf_overlay = PerfOverlay()
         
         # 画面設定を試行
         try:
@@ -83,6 +102,7 @@ class Game:
             self.screen_scale_y = 1.0
             self.current_width = SCREEN_WIDTH
             self.current_height = SCREEN_HEIGHT
+            self.build_background_cache()
         pygame.display.set_caption("Space Shooter - Enemy Variety Edition")
         self.clock = pygame.time.Clock()
         self.font = init_font()
@@ -99,10 +119,7 @@ class Game:
         self.base_dir = os.path.dirname(__file__)
         self.boss_manager = BossManager(self.base_dir, game=self)  # ボス管理を追加し、base_dirを渡す
 
-        # 背景画像の読み込みと設定
-        background_path = os.path.join(self.base_dir, "assets", "img", "game_back.png")
-        self.background_image = pygame.image.load(background_path).convert()
-        self.bg_height = self.background_image.get_height()
+        # 背景のスクロール（画像はset_screenのbuild_background_cacheで読み込み済み）
         self.scroll_y = 0
         self.scroll_speed = 1
         
@@ -136,6 +153,41 @@ class Game:
 
         # self.reset_game() # タイトル画面から開始するため、ここでは呼ばない
 
+        # スナップショット（F5で保存、F9で直前のスナップショットを読み込み）
+        self.snapshot_dir = os.path.join(self.base_dir, "snapshots")
+        self.last_snapshot_path = None
+
+        # 巻き戻し（BACKSPACE長押し）
+        self.rewind_buffer = RewindBuffer()
+        self.is_rewinding = False
+
+        # HUD（値が変わった部品だけ描き直す）
+        self.hud = HudLayer()
+        self.create_hud_widgets()
+
+        # 当たり判定（ブロードフェーズはF4で切り替え）
+        self.collision_world = CollisionWorld()
+        self.bullet_band_index = VerticalBandIndex()  # ビームでの弾消去用
+        # 描画側が使う当たり判定の結果（直近フレームの接触リストと被弾フラッシュ）
+        self.frame_contacts = {}
+        self.hit_flashes = {}  # エンティティ -> フラッシュの残りフレーム数
+        self.set_collision_backend(COLLISION_BACKEND)
+        # レイヤーの組み合わせごとの接触ハンドラー（この順番で処理する）
+        self.contact_handlers = (
+            ((LAYER_PLAYER_BULLET, LAYER_ENEMY), self.handle_bullet_enemy_contacts),
+            ((LAYER_BOMB, LAYER_ENEMY), self.handle_bomb_enemy_contacts),
+            ((LAYER_PLAYER_BULLET, LAYER_BOSS), self.handle_bullet_boss_contacts),
+            ((LAYER_BOMB, LAYER_BOSS), self.handle_bullet_boss_contacts),
+            ((LAYER_PLAYER, LAYER_POWERUP), self.handle_player_powerup_contacts),
+            ((LAYER_PLAYER, LAYER_ENEMY_BULLET), self.handle_player_enemy_bullet_contacts),
+            ((LAYER_PLAYER, LAYER_BOSS_BULLET), self.handle_player_boss_bullet_contacts),
+            ((LAYER_PLAYER, LAYER_ENEMY), self.handle_player_enemy_contacts),
+            ((LAYER_PLAYER, LAYER_WALL), self.handle_player_wall_contacts),
+            ((LAYER_PLAYER, LAYER_BOSS), self.handle_player_boss_contacts),
+            ((LAYER_SPECIAL, LAYER_ENEMY), self.handle_special_enemy_contacts),
+            ((LAYER_SPECIAL, LAYER_BOSS), self.handle_special_boss_contacts),
+        )
+
     def load_upgrade_data(self):
         try:
             with open(os.path.join(self.base_dir, 'upgrade_data.json'), 'r') as f:
@@ -180,7 +232,40 @@ class Game:
         self.difficulty_manager = DifficultyManager()
         self.boss_manager = BossManager(self.base_dir, game=self)
         self.game_state = "PLAYING"
+        self.rewind_buffer.clear()
+        self.clear_frame_contacts()
         
+    def save_snapshot(self, path=None):
+        """現在のゲーム状態をスナップショットとして保存"""
+        if path is None:
+            filename = time.strftime("snapshot_%Y%m%d_%H%M%S.snap")
+            path = os.path.join(self.snapshot_dir, filename)
+        try:
+            size = snapshot.save_snapshot(self, path)
+            self.last_snapshot_path = path
+            print(f"スナップショット保存: {path} ({size} bytes)")
+        except Exception as e:
+            print(f"スナップショット保存エラー: {e}")
+
+    def load_snapshot(self, path):
+        """スナップショットからゲーム状態を復元"""
+        try:
+            elapsed_ms = snapshot.load_snapshot(self, path)
+            self.last_snapshot_path = path
+            self.rewind_buffer.clear()
+            self.clear_frame_contacts()
+            print(f"スナップショット読み込み: {path} ({elapsed_ms:.1f}ms)")
+            return True
+        except Exception as e:
+            print(f"スナップショット読み込みエラー: {e}")
+            return False
+
+    def set_collision_backend(self, name):
+        """当たり判定に使うブロードフェーズを設定"""
+        self.collision_world.set_backend(name)
+        self.collision_backend = name
+        self.perf_overlay.set_stat('collision', f"Collision: {name}")
+
     def get_current_level_config(self):
         """現在のレベル設定を取得"""
         return self.level_system.get_current_config()
@@ -212,6 +297,21 @@ class Game:
                     # UI再描画用にアップグレード画面のscreenも更新
                     self.level_up_upgrade_screen.screen = self.screen
 
+                # F5でスナップショット保存、F9で直前のスナップショットを読み込み
+                elif event.key == pygame.K_F5 and self.game_state in ("PLAYING", "LEVEL_UP_CHOICE"):
+                    self.save_snapshot()
+                elif event.key == pygame.K_F9 and self.last_snapshot_path:
+                    self.load_snapshot(self.last_snapshot_path)
+                # F3でパフォーマンス表示切り替え
+                elif event.key == pygame.K_F3:
+                    self.perf_overlay.toggle()
+                # F4で当たり判定バックエンドを切り替え
+                elif event.key == pygame.K_F4:
+                    names = list(COLLISION_BACKENDS)
+                    next_index = (names.index(self.collision_backend) + 1) % len(names)
+                    self.set_collision_backend(names[next_index])
+                    print(f"当たり判定バックエンド: {self.collision_backend}")
+
             if self.game_state == "TITLE":
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if self.start_button and self.start_button.collidepoint(event.pos):
@@ -277,7 +377,9 @@ class Game:
         # 連続射撃のための処理
         if self.game_state == "PLAYING":
             keys = pygame.key.get_pressed()
-            if keys[pygame.K_SPACE]:
+            # BACKSPACE長押し中は巻き戻し（射撃しない）
+            self.is_rewinding = keys[pygame.K_BACKSPACE] and not self.is_paused
+            if keys[pygame.K_SPACE] and not self.is_rewinding:
                 new_bullets = self.player.shoot(self.enemies, self.boss_manager.get_current_boss())
                 if new_bullets:  # 弾が発射された場合
                     self.bullets.extend(new_bullets)
@@ -289,6 +391,13 @@ class Game:
         """ゲームロジックの更新"""
         if self.game_state != "PLAYING" or self.is_paused or self.level_up_upgrade_screen.is_active:
             return
+
+        # 巻き戻し中は記録済みのフレームを1つずつ復元
+        if self.is_rewinding:
+            self.rewind_buffer.step_back(self)
+            self.clear_frame_contacts()
+            self.perf_overlay.set_stat('rewind', self.rewind_buffer.get_stats_text())
+            return
             
         # 背景スクロール（ボス戦以外）
         if not self.boss_manager.get_current_boss():
@@ -450,6 +559,11 @@ class Game:
             print(f"Game Over. Earned {points_earned} points.")
             if self.sound_manager:
                 self.sound_manager.stop_music()
+            return
+
+        # 巻き戻し用に現在のフレームを記録
+        self.rewind_buffer.record(self)
+        self.perf_overlay.set_stat('rewind', self.rewind_buffer.get_stats_text())
     
     def spawn_enemy_wave(self, level_config=None):
         """敵の編隊を生成（レベル設定適用）"""
@@ -471,282 +585,297 @@ class Game:
                 print(f"Barrage enemy spawned in wave '{wave_type}' at level {self.level_system.current_level}")
     
     def check_collisions(self):
-        """当たり判定の処理"""
-        # プレイヤーの弾と敵の当たり判定
-        for bullet in self.bullets[:]:
-            hit_enemy = False
-            
-            # 爆弾の場合は特別な処理
-            if isinstance(bullet, Bomb):
-                # 爆弾が敵に直撃したかチェック
-                if self.player.check_bomb_collision(bullet, self.enemies):
-                    # 爆弾爆発エフェクト
-                    explosion_particles = create_bomb_explosion_effect()
-                    for particle in explosion_particles:
-                        particle['x'] = bullet.x
-                        particle['y'] = bullet.y
-                    self.particles.extend(explosion_particles)
-                    
-                    # 爆弾爆発音
-                    # play_sound('bomb_explode')
-                    
-                    # 爆発範囲内の敵にダメージ
-                    for enemy in self.enemies[:]:
-                        if check_bomb_explosion_collision(bullet, enemy):
-                            was_destroyed = enemy.take_damage(10)  # 爆発ダメージ
-                            
-                            if was_destroyed:
-                                self.enemies.remove(enemy)
-                                # スコア加算
-                                score_value = getattr(enemy, 'score_value', ENEMY_SCORE)
-                                self.score += score_value
-                                
-                                # 経験値とレベルアップ処理（新システム）
-                                old_level = self.level_system.current_level
-                                # 敵のタイプを取得（可能であれば）
-                                enemy_type = getattr(enemy, 'enemy_type', 'basic')
-                                # 計算された経験値を追加
-                                calculated_exp = self.level_system.calculate_experience_gain(BASE_EXPERIENCE_GAIN, enemy_type)
-                                self.level_system.add_experience(calculated_exp)
-                                self.level_system.total_enemies_defeated += 1
-                                
-                                # レベルアップチェック
-                                if self.level_system.current_level > old_level:
-                                    self.level_up_notification_timer = LEVEL_UP_NOTIFICATION_DURATION
-                                
-                                # 敵撃破エフェクト
-                                enemy_explosion_particles = create_explosion_effect()
-                                for particle in enemy_explosion_particles:
-                                    particle['x'] = enemy.x
-                                    particle['y'] = enemy.y
-                                self.particles.extend(enemy_explosion_particles)
-                    
-                    # 爆弾を削除
-                    self.bullets.remove(bullet)
-                    hit_enemy = True
-                    
-            else:
-                # 通常弾・レーザーの処理
-                for enemy in self.enemies[:]:
-                    if check_collision(bullet.rect, enemy.rect):
-                        # レーザーでない場合は弾を削除
-                        if not hasattr(bullet, 'penetrating') or not bullet.penetrating:
-                            self.bullets.remove(bullet)
-                        
-                        # 敵にダメージを与える
-                        damage = getattr(bullet, 'damage', 1)
-                        was_destroyed = enemy.take_damage(damage)
+        """当たり判定の処理
 
-                        # ダメージ数値を生成
-                        self.damage_numbers.append(DamageNumber(enemy.x, enemy.y, damage, self.small_font, YELLOW))
-                        
-                        if was_destroyed:
-                            # 敵が撃破された場合のみ削除
-                            self.enemies.remove(enemy)
-                            # 敵のタイプに応じてスコア加算
-                            score_value = getattr(enemy, 'score_value', ENEMY_SCORE)
-                            self.score += score_value    
-
-                            # 経験値とレベルアップ処理（新システム）
-                            enemy_type = getattr(enemy, 'enemy_type', 'basic')
-                            exp_gain = self.level_system.calculate_experience_gain(BASE_EXPERIENCE_GAIN, enemy_type)
-                            # レベルアップしたかどうかをチェック
-                            if self.level_system.add_experience(exp_gain):
-                                self.game_state = "LEVEL_UP_CHOICE"
-                                self.level_up_upgrade_screen.start_selection(self.player)
-                                self.player.on_level_up(self.level_system.current_level) # プレイヤーのレベルアップ処理を呼び出す
-
-                            self.level_system.total_enemies_defeated += 1
-
-                            # サウンド再生
-                            play_sound('enemy_hit')
-                            
-                            # 爆発エフェクト
-                            explosion_particles = create_explosion_effect()
-                            for particle in explosion_particles:
-                                particle['x'] = enemy.x
-                                particle['y'] = enemy.y
-                            self.particles.extend(explosion_particles)
-                        else:
-                            # シールドで防がれた場合のサウンド（あれば）
-                            # play_sound('shield_hit')  # 必要に応じて追加
-                            pass
-                        
-                        hit_enemy = True
-                        # レーザーでない場合はループを抜ける
-                        if not hasattr(bullet, 'penetrating') or not bullet.penetrating:
-                            break
-            
-            if hit_enemy:
-                continue
-        
-        # プレイヤーの弾とボスの当たり判定
+        判定する側（プレイヤー・自弾・爆弾・必殺技）と判定される側（敵・ボス・敵弾・壁・
+        パワーアップ）のレイヤーとマスクから接触リストを1回で作成し、
+        レイヤーの組み合わせごとのハンドラーで処理する。
+        """
         current_boss = self.boss_manager.get_current_boss()
+        sources = [self.player]
+        sources.extend(self.bullets)
+        sources.extend(self.special_attacks)
+        targets = list(self.enemies)
         if current_boss:
-            for bullet in self.bullets[:]:
-                if check_collision(bullet.rect, current_boss.rect):
-                    # レーザーでない場合は弾を削除
-                    if hasattr(bullet, 'penetrating') and bullet.penetrating:
-                        # レーザーの場合はボスに当たったら1ヒットで消す
-                        if hasattr(bullet, 'hit_boss_once'):
-                            bullet.hit_boss_once()
-                    else:
-                        self.bullets.remove(bullet)
-                    # ボスにダメージを与える
-                    damage = getattr(bullet, 'damage', 1)
-                    was_destroyed = current_boss.take_damage(damage)
-                    # ダメージ数値を生成
-                    self.damage_numbers.append(DamageNumber(current_boss.x, current_boss.y, damage, self.small_font, RED))
-                    if was_destroyed:
-                        # ボス撃破時の処理
-                        self.score += current_boss.score_value
-                        self.lives += 1  # ボス撃破で残機を1つ増やす
-                        # 大量の経験値獲得（新システム）
-                        old_level = self.level_system.current_level
-                        # ボス撃破の経験値（基本値の10倍、さらに倍率適用）
-                        boss_base_exp = BASE_EXPERIENCE_GAIN * 10
-                        self.level_system.add_experience(boss_base_exp)
-                        self.level_system.total_enemies_defeated += 1
-                        # レベルアップチェック
-                        if self.level_system.current_level > old_level:
-                            self.level_up_notification_timer = LEVEL_UP_NOTIFICATION_DURATION
-                        # ボス撃破エフェクト
-                        boss_explosion_particles = create_explosion_effect()
-                        for i in range(5):  # 複数の爆発エフェクト
-                            for particle in boss_explosion_particles:
-                                particle['x'] = current_boss.x + random.randint(-30, 30)
-                                particle['y'] = current_boss.y + random.randint(-30, 30)
-                            self.particles.extend(boss_explosion_particles)
-                        # ボス撃破音
-                        # play_sound('enemy_hit')  # ボス撃破音（適切な音があれば変更）
-                        self.game_state = "STAGE_CLEAR"
-                        print(f"Boss defeated! Score: {current_boss.score_value}")  # デバッグ用
-                    # レーザーでない場合はループを抜ける
-                    if not hasattr(bullet, 'penetrating') or not bullet.penetrating:
-                        break
+            targets.append(current_boss)
+            if isinstance(current_boss, EnvironmentalBoss):
+                targets.extend(current_boss.moving_walls)
+        targets.extend(self.enemy_bullets)
+        targets.extend(self.boss_bullets)
+        targets.extend(self.powerups)
+
+        contacts = self.collision_world.collect_contacts(sources, targets)
+        # 描画側で再利用するために公開（マスタースパークのアウトラインなど）
+        self.frame_contacts = contacts
+
+        # 被弾フラッシュの残りフレームを減らす
+        self.hit_flashes = {entity: frames - 1 for entity, frames in self.hit_flashes.items() if frames > 1}
+
+        # このフレームで削除されたオブジェクト（以降の接触は無視する）
+        removed = set()
+        for pair, handler in self.contact_handlers:
+            pair_contacts = contacts.get(pair)
+            if pair_contacts:
+                handler(pair_contacts, removed)
+
+        # MasterSparkのビーム範囲に当たっている敵弾・ボス弾だけを消す
+        beams = [attack for attack in self.special_attacks if attack.clears_bullets]
+        if beams:
+            self.clear_bullets_in_beams(beams)
+
+    def handle_bullet_enemy_contacts(self, contacts, removed):
+        """プレイヤーの弾（通常弾・レーザー）と敵"""
+        for bullet, enemy in contacts:
+            if bullet in removed or enemy in removed:
+                continue
+            # レーザーでない場合は弾を削除
+            if not bullet.penetrating:
+                self.bullets.remove(bullet)
+                removed.add(bullet)
             
-        # プレイヤーとパワーアップの当たり判定
-        for powerup in self.powerups[:]:
-            if check_collision(powerup.rect, self.player.rect):
-                self.powerups.remove(powerup)
-                if powerup.power_type == "life_up":
-                    self.lives += 1 # ライフを1増やす
-                    play_sound('powerup') # サウンド再生
-                # 他のパワーアップはレベルアップで機能追加されるため、ここでは処理しない
-                break
-        
-        # 敵の弾とプレイヤーの当たり判定
-        for bullet in self.enemy_bullets[:]:
-            if bullet.active and check_collision(bullet.rect, self.player.rect):
-                self.enemy_bullets.remove(bullet)
-                if self.player.take_damage():  # シールドで防げなかった場合
-                    self.lives -= 1
-                    
-                    # サウンド再生
-                    play_sound('player_hit')
-                    
-                    # プレイヤー被弾エフェクト
-                    explosion_particles = create_explosion_effect()
-                    for particle in explosion_particles:
-                        particle['x'] = self.player.x
-                        particle['y'] = self.player.y
-                    self.particles.extend(explosion_particles)
-                break
-        
-        # ボス弾とプレイヤーの当たり判定
-        for bullet in self.boss_bullets[:]:
-            if bullet.active and check_collision(bullet.rect, self.player.rect):
-                self.boss_bullets.remove(bullet)
-                if self.player.take_damage():  # シールドで防げなかった場合
-                    self.lives -= 1
-                    
-                    # サウンド再生
-                    play_sound('player_hit')
-                    
-                    # プレイヤー被弾エフェクト
-                    explosion_particles = create_explosion_effect()
-                    for particle in explosion_particles:
-                        particle['x'] = self.player.x
-                        particle['y'] = self.player.y
-                    self.particles.extend(explosion_particles)
-                break
-        
-        # 敵とプレイヤーの当たり判定
-        for enemy in self.enemies[:]:
-            if check_collision(enemy.rect, self.player.rect):
-                # 敵にダメージを与える（衝突時は大ダメージ）
-                was_destroyed = enemy.take_damage(3)  # 衝突時は3ダメージ
-                
-                if was_destroyed:
-                    self.enemies.remove(enemy)
-                
-                if self.player.take_damage():  # シールドで防げなかった場合
-                    self.lives -= 1
-                    
-                    # サウンド再生
-                    play_sound('player_hit')
+            # 敵にダメージを与える
+            damage = bullet.damage
+            was_destroyed = enemy.take_damage(damage)
+            self.hit_flashes[enemy] = HIT_FLASH_DURATION
+
+            # ダメージ数値を生成
+            self.damage_numbers.append(DamageNumber(enemy.x, enemy.y, damage, self.small_font, YELLOW))
+            
+            if was_destroyed:
+                # 敵が撃破された場合のみ削除
+                self.enemies.remove(enemy)
+                removed.add(enemy)
+                # 敵のタイプに応じてスコア加算
+                self.score += enemy.score_value
+
+                # 経験値とレベルアップ処理（新システム）
+                exp_gain = self.level_system.calculate_experience_gain(BASE_EXPERIENCE_GAIN, enemy.enemy_type)
+                # レベルアップしたかどうかをチェック
+                if self.level_system.add_experience(exp_gain):
+                    self.game_state = "LEVEL_UP_CHOICE"
+                    self.level_up_upgrade_screen.start_selection(self.player)
+                    self.player.on_level_up(self.level_system.current_level) # プレイヤーのレベルアップ処理を呼び出す
+
+                self.level_system.total_enemies_defeated += 1
+
+                # サウンド再生
+                play_sound('enemy_hit')
                 
-                # 衝突エフェクト
+                # 爆発エフェクト
                 explosion_particles = create_explosion_effect()
                 for particle in explosion_particles:
                     particle['x'] = enemy.x
                     particle['y'] = enemy.y
                 self.particles.extend(explosion_particles)
+
+    def handle_bomb_enemy_contacts(self, contacts, removed):
+        """爆弾と敵（このフレームに直撃した爆弾をまとめて爆発させ、爆風を1回で処理）"""
+        detonated = []
+        for bomb, enemy in contacts:
+            if bomb in removed or enemy in removed or bomb.exploded:
+                continue
+            bomb.explode()
+            bomb.explosion_radius = BOMB_EXPLOSION_RADIUS
+            detonated.append(bomb)
+
+            # 爆弾爆発エフェクト
+            explosion_particles = create_bomb_explosion_effect()
+            for particle in explosion_particles:
+                particle['x'] = bomb.x
+                particle['y'] = bomb.y
+            self.particles.extend(explosion_particles)
+            
+            # 爆弾爆発音
+            # play_sound('bomb_explode')
+            
+            # 爆弾を削除
+            self.bullets.remove(bomb)
+            removed.add(bomb)
+
+        # 爆風ごとに範囲内の敵を集め、敵ごとに当たった爆風の数をまとめる
+        blast_counts = {}
+        for bomb in detonated:
+            for enemy in self.collision_world.query_radius(bomb.x, bomb.y, bomb.explosion_radius, LAYER_ENEMY):
+                if enemy not in removed:
+                    blast_counts[enemy] = blast_counts.get(enemy, 0) + 1
+
+        # 爆発範囲内の敵にダメージ（重なった爆風は撃破されるまで順に当てる）
+        for enemy, blast_count in blast_counts.items():
+            for _ in range(blast_count):
+                was_destroyed = enemy.take_damage(10)  # 爆発ダメージ
+                self.hit_flashes[enemy] = HIT_FLASH_DURATION
+                if not was_destroyed:
+                    continue
+
+                self.enemies.remove(enemy)
+                removed.add(enemy)
+                # スコア加算
+                self.score += enemy.score_value
+                
+                # 経験値とレベルアップ処理（新システム）
+                old_level = self.level_system.current_level
+                # 計算された経験値を追加
+                calculated_exp = self.level_system.calculate_experience_gain(BASE_EXPERIENCE_GAIN, enemy.enemy_type)
+                self.level_system.add_experience(calculated_exp)
+                self.level_system.total_enemies_defeated += 1
+                
+                # レベルアップチェック
+                if self.level_system.current_level > old_level:
+                    self.level_up_notification_timer = LEVEL_UP_NOTIFICATION_DURATION
+                
+                # 敵撃破エフェクト
+                enemy_explosion_particles = create_explosion_effect()
+                for particle in enemy_explosion_particles:
+                    particle['x'] = enemy.x
+                    particle['y'] = enemy.y
+                self.particles.extend(enemy_explosion_particles)
                 break
-        
-        # プレイヤーと環境ボス移動壁の当たり判定
-        current_boss = self.boss_manager.get_current_boss()
-        if current_boss and isinstance(current_boss, EnvironmentalBoss):
-            for wall in current_boss.moving_walls:
-                if check_collision(self.player.rect, wall.rect):
-                    if self.player.take_damage():  # シールドで防げなかった場合
-                        self.lives -= 1
-                        
-                        # サウンド再生
-                        play_sound('player_hit')
-                    
-                        # プレイヤー被弾エフェクト
-                        explosion_particles = create_explosion_effect()
-                        for particle in explosion_particles:
-                            particle['x'] = self.player.x
-                            particle['y'] = self.player.y
-                        self.particles.extend(explosion_particles)
-                    break
-        
-        # ボスとプレイヤーの当たり判定
-        current_boss = self.boss_manager.get_current_boss()
-        if current_boss and check_collision(current_boss.rect, self.player.rect):
+
+    def handle_bullet_boss_contacts(self, contacts, removed):
+        """プレイヤーの弾（通常弾・レーザー・爆弾）とボス"""
+        for bullet, boss in contacts:
+            if bullet in removed:
+                continue
+            if bullet.penetrating:
+                # レーザーの場合はボスに当たったら1ヒットで消す
+                bullet.hit_boss_once()
+            else:
+                self.bullets.remove(bullet)
+                removed.add(bullet)
+            # ボスにダメージを与える
+            damage = bullet.damage
+            was_destroyed = boss.take_damage(damage)
+            self.hit_flashes[boss] = HIT_FLASH_DURATION
+            # ダメージ数値を生成
+            self.damage_numbers.append(DamageNumber(boss.x, boss.y, damage, self.small_font, RED))
+            if was_destroyed:
+                # ボス撃破時の処理
+                self.score += boss.score_value
+                self.lives += 1  # ボス撃破で残機を1つ増やす
+                # 大量の経験値獲得（新システム）
+                old_level = self.level_system.current_level
+                # ボス撃破の経験値（基本値の10倍、さらに倍率適用）
+                boss_base_exp = BASE_EXPERIENCE_GAIN * 10
+                self.level_system.add_experience(boss_base_exp)
+                self.level_system.total_enemies_defeated += 1
+                # レベルアップチェック
+                if self.level_system.current_level > old_level:
+                    self.level_up_notification_timer = LEVEL_UP_NOTIFICATION_DURATION
+                # ボス撃破エフェクト
+                boss_explosion_particles = create_explosion_effect()
+                for i in range(5):  # 複数の爆発エフェクト
+                    for particle in boss_explosion_particles:
+                        particle['x'] = boss.x + random.randint(-30, 30)
+                        particle['y'] = boss.y + random.randint(-30, 30)
+                    self.particles.extend(boss_explosion_particles)
+                # ボス撃破音
+                # play_sound('enemy_hit')  # ボス撃破音（適切な音があれば変更）
+                self.game_state = "STAGE_CLEAR"
+                print(f"Boss defeated! Score: {boss.score_value}")  # デバッグ用
+            # レーザー以外は1フレームに1発だけボスに当たる
+            if not bullet.penetrating:
+                break
+
+    def handle_player_powerup_contacts(self, contacts, removed):
+        """プレイヤーとパワーアップ（1フレームに1つだけ取得）"""
+        powerup = contacts[0][1]
+        self.powerups.remove(powerup)
+        removed.add(powerup)
+        if powerup.power_type == "life_up":
+            self.lives += 1 # ライフを1増やす
+            play_sound('powerup') # サウンド再生
+        # 他のパワーアップはレベルアップで機能追加されるため、ここでは処理しない
+
+    def handle_player_enemy_bullet_contacts(self, contacts, removed):
+        """プレイヤーと敵弾（1フレームに1発だけ被弾）"""
+        self.hit_player_with_bullet(contacts, self.enemy_bullets, removed)
+
+    def handle_player_boss_bullet_contacts(self, contacts, removed):
+        """プレイヤーとボス弾（1フレームに1発だけ被弾）"""
+        self.hit_player_with_bullet(contacts, self.boss_bullets, removed)
+
+    def hit_player_with_bullet(self, contacts, bullets, removed):
+        """最初に当たった有効な弾をbulletsから削除してプレイヤーに1ダメージ"""
+        for _, bullet in contacts:
+            if not bullet.active:
+                continue
+            bullets.remove(bullet)
+            removed.add(bullet)
+            self.damage_player(1)
+            break
+
+    def handle_player_enemy_contacts(self, contacts, removed):
+        """プレイヤーと敵本体（1フレームに1体だけ）"""
+        for _, enemy in contacts:
+            if enemy in removed:
+                continue
+            # 敵にダメージを与える（衝突時は大ダメージ）
+            was_destroyed = enemy.take_damage(3)  # 衝突時は3ダメージ
+            
+            if was_destroyed:
+                self.enemies.remove(enemy)
+                removed.add(enemy)
+            
             if self.player.take_damage():  # シールドで防げなかった場合
-                self.lives -= 2  # ボスとの衝突は2ダメージ
+                self.lives -= 1
                 
                 # サウンド再生
                 play_sound('player_hit')
-                
-                # 衝突エフェクト
-                explosion_particles = create_explosion_effect()
-                for particle in explosion_particles:
-                    particle['x'] = self.player.x
-                    particle['y'] = self.player.y
-                self.particles.extend(explosion_particles)
+            
+            # 衝突エフェクト
+            explosion_particles = create_explosion_effect()
+            for particle in explosion_particles:
+                particle['x'] = enemy.x
+                particle['y'] = enemy.y
+            self.particles.extend(explosion_particles)
+            break
 
-        # 必殺技と敵の当たり判定
-        for attack in self.special_attacks:
-            for enemy in self.enemies[:]:
-                if check_collision(attack.rect, enemy.rect):
-                    if enemy.take_damage(attack.damage):
-                        self.enemies.remove(enemy)
-                        self.score += getattr(enemy, 'score_value', ENEMY_SCORE)
+    def handle_player_wall_contacts(self, contacts, removed):
+        """プレイヤーと環境ボスの移動壁"""
+        self.damage_player(1)
 
-            # MasterSparkのビーム範囲に当たっている敵弾・ボス弾だけを消す
-            if hasattr(attack, 'rect') and isinstance(attack, MasterSpark):
-                # MasterSparkの範囲内の弾のみを消去
-                self.clear_bullets_in_master_spark_range(attack)
+    def handle_player_boss_contacts(self, contacts, removed):
+        """プレイヤーとボス本体（衝突は2ダメージ）"""
+        self.damage_player(2)
 
-            if current_boss:
-                if check_collision(attack.rect, current_boss.rect):
-                    if current_boss.take_damage(attack.damage):
-                        self.score += current_boss.score_value
-                        self.game_state = "STAGE_CLEAR"
+    def damage_player(self, damage):
+        """プレイヤーの被弾処理（シールド・無敵で防げなかった場合のみライフを減らす）"""
+        if self.player.take_damage():  # シールドで防げなかった場合
+            self.lives -= damage
+            
+            # サウンド再生
+            play_sound('player_hit')
+            
+            # プレイヤー被弾エフェクト
+            explosion_particles = create_explosion_effect()
+            for particle in explosion_particles:
+                particle['x'] = self.player.x
+                particle['y'] = self.player.y
+            self.particles.extend(explosion_particles)
+
+    def handle_special_enemy_contacts(self, contacts, removed):
+        """必殺技と敵"""
+        for attack, enemy in contacts:
+            if enemy in removed:
+                continue
+            self.hit_flashes[enemy] = HIT_FLASH_DURATION
+            if enemy.take_damage(attack.damage):
+                self.enemies.remove(enemy)
+                removed.add(enemy)
+                self.score += enemy.score_value
+
+    def handle_special_boss_contacts(self, contacts, removed):
+        """必殺技とボス"""
+        for attack, boss in contacts:
+            self.hit_flashes[boss] = HIT_FLASH_DURATION
+            if boss.take_damage(attack.damage):
+                self.score += boss.score_value
+                self.game_state = "STAGE_CLEAR"
+
+    def clear_frame_contacts(self):
+        """描画用の接触リストと被弾フラッシュを破棄（巻き戻しやステージ切り替え時）"""
+        self.frame_contacts = {}
+        self.hit_flashes = {}
 
     def next_stage(self):
         self.level_system.next_level()
@@ -757,6 +886,8 @@ class Game:
         self.boss_bullets.clear()
         self.powerups.clear()
         self.game_state = "PLAYING"
+        self.rewind_buffer.clear()
+        self.clear_frame_contacts()
     
     def draw(self):
         """描画処理"""
@@ -764,14 +895,10 @@ class Game:
         if self.fullscreen:
             self.screen.fill(BLACK)
         
-        # 背景画像のスクロール描画（ゲームビューポート内に制限）
-        bg_scaled = pygame.transform.scale(self.background_image, (self.current_width, self.current_height))
-        for x in range(0, self.current_width, bg_scaled.get_width()):
-            y1 = self.scroll_y
-            y2 = self.scroll_y - self.current_height
-            # ゲームビューポート内に描画
-            self.screen.blit(bg_scaled, (x + self.game_viewport.x, y1 + self.game_viewport.y))
-            self.screen.blit(bg_scaled, (x + self.game_viewport.x, y2 + self.game_viewport.y))
+        # 背景画像のスクロール描画（縦に2枚並べたキャッシュから表示範囲を1回で転送）
+        offset = int(self.scroll_y) % self.current_height
+        area = (0, self.current_height - offset, self.current_width, self.current_height)
+        self.screen.blit(self.background_strip, self.game_viewport.topleft, area)
 
         if self.game_state == "TITLE":
             # タイトルとボタンを画面比率に応じて配置
@@ -813,17 +940,10 @@ class Game:
             
             self.player.draw(game_surface)
 
-            for bullet in self.bullets:
-                bullet.draw(game_surface)
-
-            for bullet in self.enemy_bullets:
-                if bullet.active:
-                    bullet.draw(game_surface)
-
-            # ボス弾の描画
-            for bullet in self.boss_bullets:
-                if bullet.active:
-                    bullet.draw(game_surface)
+            # 弾はアトラスからまとめて描画
+            draw_bullets(game_surface, self.bullets)
+            draw_bullets(game_surface, self.enemy_bullets)
+            draw_bullets(game_surface, self.boss_bullets)
 
             for enemy in self.enemies:
                 enemy.draw(game_surface)
@@ -842,15 +962,17 @@ class Game:
             for attack in self.special_attacks:
                 attack.draw(game_surface)
 
-            # マスタースパークがアクティブな場合、敵にアウトラインを描画
-            for attack in self.special_attacks:
-                if isinstance(attack, MasterSpark):
-                    for enemy in self.enemies:
-                        if check_collision(attack.rect, enemy.rect):
-                            enemy.draw_outline(game_surface, YELLOW, 2) # 黄色いアウトライン
-                    current_boss = self.boss_manager.get_current_boss()
-                    if current_boss and check_collision(attack.rect, current_boss.rect):
-                        current_boss.draw_outline(game_surface, YELLOW, 3) # ボスには太いアウトライン
+            # 被弾した敵・ボスをフラッシュ（白いアウトライン、体力バーは各自のdrawで描画済み）
+            for entity in self.hit_flashes:
+                if entity.active:
+                    entity.draw_outline(game_surface, WHITE, 2)
+
+            # マスタースパークに当たっている敵にアウトラインを描画（当たり判定の接触リストを再利用）
+            for _, enemy in self.frame_contacts.get((LAYER_SPECIAL, LAYER_ENEMY), ()):
+                if enemy.active:
+                    enemy.draw_outline(game_surface, YELLOW, 2) # 黄色いアウトライン
+            for _, boss in self.frame_contacts.get((LAYER_SPECIAL, LAYER_BOSS), ())[:1]:
+                boss.draw_outline(game_surface, YELLOW, 3) # ボスには太いアウトライン
 
             # パーティクルの描画
             draw_particles(game_surface, self.particles)
@@ -865,20 +987,7 @@ class Game:
 
             # --- UI の描画 ---
             # UI要素は全画面時でもメインスクリーンに直接描画（ビューポート外でも表示）
-            draw_score(self.screen, self.score, self.font)
-            draw_lives(self.screen, self.lives, self.font)
-            draw_powerups(self.screen, self.player, self.small_font)
-            # draw_enemy_info(self.screen, self.enemies, self.small_font)
-            draw_level_info(self.screen, self.level_system, self.font, self.small_font)
-            # draw_stats_panel(self.screen, self.level_system, self.font, self.small_font)
-            # draw_difficulty_info(self.screen, self.level_system, self.font, self.small_font)
-
-            # 必殺技ゲージの描画
-            draw_special_gauge(self.screen, self.player, self.font)
-
-            # サウンド状態表示と武器情報
-            draw_sound_status(self.screen, self.sound_manager, self.small_font)
-            draw_weapon_status(self.screen, self.player, self.small_font)
+            self.hud.draw(self.screen)
 
             if self.is_paused:
                 draw_pause_screen(self.screen, self.font)
@@ -886,9 +995,9 @@ class Game:
         elif self.game_state == "LEVEL_UP_CHOICE":
             # --- ゲーム画面を背景として描画 ---
             self.player.draw(self.screen)
-            for bullet in self.bullets: bullet.draw(self.screen)
-            for bullet in self.enemy_bullets: bullet.draw(self.screen)
-            for bullet in self.boss_bullets: bullet.draw(self.screen)
+            draw_bullets(self.screen, self.bullets)
+            draw_bullets(self.screen, self.enemy_bullets)
+            draw_bullets(self.screen, self.boss_bullets)
             for enemy in self.enemies: enemy.draw(self.screen)
             current_boss = self.boss_manager.get_current_boss()
             if current_boss:
@@ -902,16 +1011,7 @@ class Game:
                 dn.draw(self.screen)
 
             # --- UIも背景として描画 ---
-            draw_score(self.screen, self.score, self.font)
-            draw_lives(self.screen, self.lives, self.font)
-            draw_powerups(self.screen, self.player, self.small_font)
-            # draw_enemy_info(self.screen, self.enemies, self.small_font)
-            draw_level_info(self.screen, self.level_system, self.font, self.small_font)
-            # draw_stats_panel(self.screen, self.level_system, self.font, self.small_font)
-            # draw_difficulty_info(self.screen, self.level_system, self.small_font)
-            draw_special_gauge(self.screen, self.player, self.font)
-            draw_sound_status(self.screen, self.sound_manager, self.small_font)
-            draw_weapon_status(self.screen, self.player, self.small_font)
+            self.hud.draw(self.screen)
 
             # --- アップグレード選択画面を最前面に描画 ---
             self.level_up_upgrade_screen.draw()
@@ -1038,6 +1138,42 @@ class Game:
             self.current_height = SCREEN_HEIGHT
             self.fullscreen = False
 
+        # 背景キャッシュを新しい解像度で作り直す
+        self.build_background_cache()
+
+    def create_hud_widgets(self):
+        """HUDの部品を登録（キーの値が変わったときだけ描き直される）"""
+        hud = self.hud
+        hud.add_widget('score', lambda: self.score,
+                       lambda surface: draw_score(surface, self.score, self.font))
+        hud.add_widget('lives', lambda: self.lives,
+                       lambda surface: draw_lives(surface, self.lives, self.font))
+        hud.add_widget('powerups', lambda: ("life_up" in self.player.powerups, bool(self.player.powerups)),
+                       lambda surface: draw_powerups(surface, self.player, self.small_font))
+        hud.add_widget('level', lambda: (self.level_system.current_level, self.level_system.experience, self.level_system.experience_to_next_level),
+                       lambda surface: draw_level_info(surface, self.level_system, self.font, self.small_font))
+        # 必殺技ゲージは段階ごとにまとめて描き直す
+        hud.add_widget('special', lambda: (int(self.player.special_gauge * HUD_GAUGE_BUCKETS / SPECIAL_GAUGE_MAX), self.player.special_stock),
+                       lambda surface: draw_special_gauge(surface, self.player, self.font))
+        hud.add_widget('sound', lambda: self.sound_manager.music_playing if self.sound_manager else None,
+                       lambda surface: draw_sound_status(surface, self.sound_manager, self.small_font))
+        hud.add_widget('weapon', lambda: self.player.current_weapon,
+                       lambda surface: draw_weapon_status(surface, self.player, self.small_font))
+
+    def build_background_cache(self):
+        """現在の解像度に拡大した背景を縦に2枚並べてキャッシュ（解像度変更時のみ再生成）"""
+        # 画像の変換には表示モードが必要なので、初回の読み込みもここで行う
+        self.background_image = assets.get("game_back.png")
+        self.bg_height = self.background_image.get_height()
+        width, height = self.current_width, self.current_height
+        bg_scaled = pygame.transform.scale(self.background_image, (width, height))
+        self.background_strip = pygame.Surface((width, height * 2)).convert()
+        self.background_strip.blit(bg_scaled, (0, 0))
+        self.background_strip.blit(bg_scaled, (0, height))
+
+        cache_bytes = self.background_strip.get_bytesize() * width * height * 2
+        self.perf_overlay.set_stat('background', f"BG cache: {width}x{height * 2} {cache_bytes / (1024 * 1024):.1f}MB")
+
     def create_buttons(self):
         """画面比率に応じたボタンRectを再計算"""
         # ボタンは描画時に動的に作成されるため、ここでは何もしない
@@ -1055,71 +1191,46 @@ class Game:
             
             # utils.pyのdraw_fps_counter関数を使用してFPSを表示
             from utils import draw_fps_counter
-            draw_fps_counter(self.screen, fps, self.small_font, position="topright")
+            fps_rect = draw_fps_counter(self.screen, fps, self.small_font, position="topright")
+            if fps_rect:
+                if self.perf_overlay.visible:
+                    self.perf_overlay.set_stat('sprites', sprite_cache.get_stats_text())
+                    self.perf_overlay.set_stat('assets', assets.get_stats_text())
+                    self.perf_overlay.set_stat('bullets', get_atlas_stats_text())
+                    self.perf_overlay.set_stat('rotations', get_rotation_stats_text())
+                    self.perf_overlay.set_stat('effects', get_effect_stats_text())
+                    self.perf_overlay.set_stat('overlays', get_overlay_stats_text())
+                    self.perf_overlay.set_stat('text', get_text_cache_stats_text())
+                    self.perf_overlay.set_stat('hud', self.hud.get_stats_text())
+                self.perf_overlay.draw(self.screen, self.small_font, top=fps_rect.bottom + 8)
             
         except Exception as e:
             # FPS表示でエラーが発生した場合は何もしない
             pass
 
-    def clear_bullets_in_master_spark_range(self, master_spark):
-        """MasterSparkの範囲内の弾のみを消去"""
+    def clear_bullets_in_beams(self, attacks):
+        """MasterSparkなどのビーム範囲内の敵弾・ボス弾のみを消去"""
         try:
-            # MasterSparkの範囲を取得
-            spark_rect = master_spark.rect
-            
-            # 敵弾の範囲内チェック
-            bullets_to_remove = []
-            for bullet in self.enemy_bullets:
-                if bullet.active and self.is_bullet_in_master_spark_range(bullet, master_spark):
-                    bullets_to_remove.append(bullet)
-            
-            # 範囲内の敵弾を削除し、エフェクトを追加
-            for bullet in bullets_to_remove:
-                if bullet in self.enemy_bullets:
-                    # 弾消去エフェクトを生成
-                    from utils import create_bullet_clear_effect
-                    clear_effect = create_bullet_clear_effect(bullet.x, bullet.y, color=YELLOW)
-                    self.particles.extend(clear_effect)
-                    self.enemy_bullets.remove(bullet)
-            
-            # ボス弾の範囲内チェック
-            boss_bullets_to_remove = []
-            for bullet in self.boss_bullets:
-                if bullet.active and self.is_bullet_in_master_spark_range(bullet, master_spark):
-                    boss_bullets_to_remove.append(bullet)
-            
-            # 範囲内のボス弾を削除し、エフェクトを追加
-            for bullet in boss_bullets_to_remove:
-                if bullet in self.boss_bullets:
-                    # 弾消去エフェクトを生成
-                    from utils import create_bullet_clear_effect
-                    clear_effect = create_bullet_clear_effect(bullet.x, bullet.y, color=RED)
+            from utils import create_bullet_clear_effect
+            for bullets, color in ((self.enemy_bullets, YELLOW), (self.boss_bullets, RED)):
+                if not bullets:
+                    continue
+                # 弾の中心をx順に並べ、ビームの帯に入る弾だけを取り出す
+                self.bullet_band_index.build_points([(bullet.x, bullet.y) for bullet in bullets])
+                hit_indices = set()
+                for attack in attacks:
+                    hit_indices.update(self.bullet_band_index.query_points(*attack.get_band()))
+
+                bullets_to_remove = [bullets[index] for index in sorted(hit_indices) if bullets[index].active]
+                # 範囲内の弾を削除し、エフェクトを追加
+                for bullet in bullets_to_remove:
+                    clear_effect = create_bullet_clear_effect(bullet.x, bullet.y, color=color)
                     self.particles.extend(clear_effect)
-                    self.boss_bullets.remove(bullet)
+                    bullets.remove(bullet)
                     
         except Exception as e:
             print(f"MasterSpark範囲内弾消去エラー: {e}")
     
-    def is_bullet_in_master_spark_range(self, bullet, master_spark):
-        """弾がMasterSparkの範囲内にあるかチェック"""
-        try:
-            # MasterSparkの範囲判定メソッドを使用
-            if hasattr(master_spark, 'is_point_in_range'):
-                # 弾の中心座標が範囲内かチェック
-                return master_spark.is_point_in_range(bullet.x, bullet.y)
-            else:
-                # フォールバック: 矩形での判定
-                spark_rect = master_spark.rect
-                if hasattr(bullet, 'rect'):
-                    return check_collision(bullet.rect, spark_rect)
-                else:
-                    return (spark_rect.left <= bullet.x <= spark_rect.right and 
-                           0 <= bullet.y <= spark_rect.bottom)
-                
-        except Exception as e:
-            print(f"弾範囲チェックエラー: {e}")
-            return False
-    
     def maintain_fixed_fps(self):
         """FPSを60に固定する"""
         if not FIXED_FPS:
@@ -1168,6 +1279,11 @@ class Game:
             return 0
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument("--snapshot", help="起動直後に読み込むスナップショットファイル")
+    parser.add_argument("--collision-backend", choices=list(COLLISION_BACKENDS), help="当たり判定のブロードフェーズ")
+    args = parser.parse_args()
+
     try:
         # pygameの初期化を確認
         if not pygame.get_init():
@@ -1179,6 +1295,12 @@ if __name__ == "__main__":
         
         # ゲームを開始
         game = Game()
+        if args.collision_backend:
+            game.set_collision_backend(args.collision_backend)
+        # スナップショット指定時はタイトル画面を飛ばしてその場面から開始
+        if args.snapshot and game.load_snapshot(args.snapshot):
+            if game.sound_manager and game.game_state == "PLAYING":
+                game.sound_manager.play_music()
         game.run()
         
     except Exception as e:
@@ -2,6 +2,8 @@ import pygame
 import math
 import os
 from settings import *
+from asset_manager import assets
+from effect_cache import draw_effect
 
 class Option:
     """プレイヤーの子機クラス"""
@@ -29,9 +31,7 @@ class Option:
         self.shoot_interval = 20  # 子機の射撃間隔
         
         # ビジュアル
-        image_path = os.path.join(os.path.dirname(__file__), "assets", "img", "Image.png")
-        self.image = pygame.image.load(image_path).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
+        self.image = assets.get("Image.png", (self.size, self.size))
         self.pulse_timer = 0
         self.color = CYAN
         
@@ -108,11 +108,7 @@ class Option:
         pulse_radius = int(self.size//2 + 5 * math.sin(self.pulse_timer * 2))
         
         # 外側のパルス
-        pulse_surface = pygame.Surface((pulse_radius * 2, pulse_radius * 2), pygame.SRCALPHA)
-        pulse_color = (*self.color[:3], pulse_alpha)
-        pygame.draw.circle(pulse_surface, pulse_color, 
-                         (pulse_radius, pulse_radius), pulse_radius)
-        screen.blit(pulse_surface, (self.x - pulse_radius, self.y - pulse_radius))
+        draw_effect(screen, "circle", (self.x, self.y), pulse_radius, pulse_alpha, self.color[:3])
         
         # 子機画像の描画
         img_rect = self.image.get_rect(center=(self.x, self.y))
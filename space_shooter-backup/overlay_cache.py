@@ -0,0 +1,48 @@
+import pygame
+from settings import *
+
+# (名前, 画面サイズ, key) -> (静的な文字などが描かれた範囲だけ切り出した透明レイヤー, 画面上の左上座標)
+_overlays = {}
+# 画面サイズ -> 暗転用の黒いSurface（透明度はblitごとに設定）
+_dim_surfaces = {}
+
+
+def get_overlay(name, size, draw_func, key=None):
+    """draw_funcで静的な部分を描き、描かれた範囲だけ切り出したレイヤーと左上座標を取得（画面サイズとkeyごとに一度だけ作成）"""
+    cache_key = (name, size, key)
+    overlay = _overlays.get(cache_key)
+    if overlay is None:
+        # 同じ名前の古い解像度・内容のものは捨てる
+        for old_key in [k for k in _overlays if k[0] == name]:
+            del _overlays[old_key]
+        # 描画は全画面の一時レイヤーに行い、保持するのは描かれた範囲だけ
+        layer = pygame.Surface(size, pygame.SRCALPHA)
+        draw_func(layer)
+        rect = layer.get_bounding_rect()
+        overlay = (layer.subsurface(rect).copy(), rect.topleft)
+        _overlays[cache_key] = overlay
+    return overlay
+
+def draw_dim(screen, alpha):
+    """画面全体をalphaの黒で暗くする（黒いSurfaceは解像度ごとに使い回す）"""
+    size = screen.get_size()
+    surface = _dim_surfaces.get(size)
+    if surface is None:
+        _dim_surfaces.clear()
+        surface = pygame.Surface(size)
+        surface.fill(BLACK)
+        _dim_surfaces[size] = surface
+    surface.set_alpha(alpha)
+    screen.blit(surface, (0, 0))
+
+def draw_overlay(screen, name, alpha, draw_func, key=None):
+    """画面を暗くし、キャッシュ済みの静的な部分を転送"""
+    draw_dim(screen, alpha)
+    layer, topleft = get_overlay(name, screen.get_size(), draw_func, key)
+    screen.blit(layer, topleft)
+
+def get_overlay_stats_text():
+    """パフォーマンス表示用の文字列"""
+    surfaces = [layer for layer, _ in _overlays.values()] + list(_dim_surfaces.values())
+    memory = sum(s.get_bytesize() * s.get_width() * s.get_height() for s in surfaces)
+    return f"Overlays: {len(_overlays)} cached {memory / 1024:.0f}KB"
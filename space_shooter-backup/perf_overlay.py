@@ -0,0 +1,45 @@
+import pygame
+from settings import *
+from utils import render_text
+
+
+class PerfOverlay:
+    """パフォーマンス計測値の表示（F3で表示切り替え）"""
+    def __init__(self):
+        self.visible = False
+        self.stats = {}
+        self.background = None  # 半透明の黒い背景（各行はここから必要な大きさだけ転送）
+
+    def toggle(self):
+        """表示/非表示を切り替え"""
+        self.visible = not self.visible
+
+    def set_stat(self, name, text):
+        """計測値を登録（同じ名前は上書き）"""
+        self.stats[name] = text
+
+    def draw(self, screen, font, top=45):
+        """画面右上（FPS表示の下）に計測値を一覧表示"""
+        if not self.visible or not self.stats:
+            return
+
+        x = screen.get_width() - 20
+        y = top
+        for text in self.stats.values():
+            text_surface = render_text(font, text, WHITE)
+            text_rect = text_surface.get_rect(topright=(x, y))
+
+            # 背景の四角形を描画（半透明、足りなくなったときだけ大きく作り直す）
+            bg_rect = text_rect.inflate(10, 4)
+            background = self.background
+            if background is None or background.get_width() < bg_rect.width or background.get_height() < bg_rect.height:
+                width = max(bg_rect.width, background.get_width() if background else 0)
+                height = max(bg_rect.height, background.get_height() if background else 0)
+                background = pygame.Surface((width, height))
+                background.set_alpha(180)
+                background.fill(BLACK)
+                self.background = background
+
+            screen.blit(background, bg_rect, (0, 0, bg_rect.width, bg_rect.height))
+            screen.blit(text_surface, text_rect)
+            y += text_rect.height + 6
@@ -2,10 +2,19 @@ import pygame
 import math
 import os
 from settings import *
+from asset_manager import assets
+from effect_cache import draw_effect
 from option import OptionManager
 from bullet import Bullet, Laser, Bomb # Bullet, Laser, Bombを直接インポート
 
 class Player(pygame.sprite.Sprite):
+    # 当たり判定の設定
+    collision_layer = LAYER_PLAYER
+    collision_mask = LAYER_ENEMY | LAYER_BOSS | LAYER_ENEMY_BULLET | LAYER_BOSS_BULLET | LAYER_WALL | LAYER_POWERUP
+    round_hitbox = False
+    swept_collision = False
+    band_query = False
+
     def __init__(self, x, y, upgrade_data=None, game=None):
         super().__init__()
         self.x = x
@@ -28,9 +37,7 @@ class Player(pygame.sprite.Sprite):
         self.apply_upgrades()
 
         self.rect = pygame.Rect(x - self.size//2, y - self.size//2, self.size, self.size)
-        image_path = os.path.join(os.path.dirname(__file__), "assets", "img", "Image.png")
-        self.image = pygame.image.load(image_path).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
+        self.image = assets.get("Image.png", (self.size, self.size))
         
         self.powerups = {}
         self.shield_active = False
@@ -184,17 +191,6 @@ class Player(pygame.sprite.Sprite):
             return MasterSpark(self, boss)
         return None
     
-    def check_bomb_collision(self, bomb, enemies):
-        if hasattr(bomb, 'exploded') and bomb.exploded: return False
-        for enemy in enemies:
-            if hasattr(bomb, 'rect') and hasattr(enemy, 'rect'):
-                if bomb.rect.colliderect(enemy.rect):
-                    if hasattr(bomb, 'explode'):
-                        bomb.explode()
-                        bomb.explosion_radius = BOMB_EXPLOSION_RADIUS
-                    return True
-        return False
-    
     def take_damage(self):
         # セーフティ発動時はダメージを無効化し、1回で解除
         if hasattr(self, 'safety_flag') and self.safety_flag:
@@ -247,11 +243,7 @@ class Player(pygame.sprite.Sprite):
 
         if self.has_shield: # レベルアップによるシールド表示
             shield_alpha = 100 + int(50 * math.sin(pygame.time.get_ticks() * 0.01))
-            shield_color_base = BLUE[:3]
-            shield_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            shield_color = (*shield_color_base, min(255, max(0, shield_alpha)))
-            pygame.draw.circle(shield_surface, shield_color, (self.size, self.size), self.size)
-            screen.blit(shield_surface, (self.x - self.size, self.y - self.size))
+            draw_effect(screen, "circle", (self.x, self.y), self.size, shield_alpha, BLUE[:3])
         
         img_rect = self.image.get_rect(center=(self.x, self.y))
         screen.blit(self.image, img_rect)
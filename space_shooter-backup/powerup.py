@@ -2,8 +2,16 @@ import pygame
 import random
 import math  
 from settings import *
+from font_registry import fonts
 
 class PowerUp:
+    # 当たり判定の設定
+    collision_layer = LAYER_POWERUP
+    collision_mask = 0
+    round_hitbox = False
+    swept_collision = False
+    mask_collision = False
+
     def __init__(self, x, y, power_type, game=None):
         self.x = x
         self.y = y
@@ -42,7 +50,7 @@ class PowerUp:
             pygame.draw.polygon(screen, GREEN, points)
             pygame.draw.polygon(screen, WHITE, points, 2)
             # "T"マーク
-            font = pygame.font.Font(None, 16)
+            font = fonts.get(None, 16)
             text = font.render("T", True, BLACK)
             text_rect = text.get_rect(center=(self.x, float_y))
             screen.blit(text, text_rect)
@@ -52,7 +60,7 @@ class PowerUp:
             pygame.draw.circle(screen, YELLOW, (int(self.x), int(float_y)), self.size//2)
             pygame.draw.circle(screen, WHITE, (int(self.x), int(float_y)), self.size//2, 2)
             # "R"マーク
-            font = pygame.font.Font(None, 16)
+            font = fonts.get(None, 16)
             text = font.render("R", True, BLACK)
             text_rect = text.get_rect(center=(self.x, float_y))
             screen.blit(text, text_rect)
@@ -68,7 +76,7 @@ class PowerUp:
             pygame.draw.polygon(screen, BLUE, points)
             pygame.draw.polygon(screen, WHITE, points, 2)
             # "S"マーク
-            font = pygame.font.Font(None, 16)
+            font = fonts.get(None, 16)
             text = font.render("S", True, WHITE)
             text_rect = text.get_rect(center=(self.x, float_y))
             screen.blit(text, text_rect)
@@ -84,7 +92,7 @@ class PowerUp:
             pygame.draw.polygon(screen, MAGENTA, points)
             pygame.draw.polygon(screen, WHITE, points, 2)
             # "+"マーク
-            font = pygame.font.Font(None, 16)
+            font = fonts.get(None, 16)
             text = font.render("+", True, WHITE)
             text_rect = text.get_rect(center=(self.x, float_y))
             screen.blit(text, text_rect)
@@ -108,7 +116,7 @@ class PowerUp:
                            (self.x, float_y + rect_height//2), 2)
             
             # "L"マーク
-            font = pygame.font.Font(None, 16)
+            font = fonts.get(None, 16)
             text = font.render("L", True, WHITE)
             text_rect = text.get_rect(center=(self.x, float_y))
             screen.blit(text, text_rect)
@@ -125,7 +133,7 @@ class PowerUp:
             pygame.draw.polygon(screen, WHITE, points, 2)
             
             # 爆発マーク
-            font = pygame.font.Font(None, 16)
+            font = fonts.get(None, 16)
             text = font.render("B", True, WHITE)
             text_rect = text.get_rect(center=(self.x, float_y))
             screen.blit(text, text_rect)
@@ -151,7 +159,7 @@ class PowerUp:
             pygame.draw.polygon(heart_surface, WHITE, points, 2)
             screen.blit(heart_surface, (self.x - cx, float_y - cy))
             # "1UP"テキスト
-            font = pygame.font.Font(None, 18)
+            font = fonts.get(None, 18)
             text = font.render("1UP", True, WHITE)
             text_rect = text.get_rect(center=(self.x, float_y))
             screen.blit(text, text_rect)
\ No newline at end of file
@@ -0,0 +1,262 @@
+import time
+from array import array
+from collections import deque
+from operator import attrgetter
+import pygame
+from settings import *
+
+# 毎フレーム記録するGameの数値属性
+REWIND_GAME_FIELDS = (
+    'score',
+    'lives',
+    'enemy_spawn_timer',
+    'powerup_spawn_timer',
+    'wave_spawn_timer',
+    'wave_spawn_interval',
+    'scroll_y',
+    'level_up_notification_timer',
+    'level_transition_timer',
+)
+
+# 記録対象のエンティティリスト（Gameの属性名）
+REWIND_ENTITY_LISTS = (
+    'bullets',
+    'enemies',
+    'enemy_bullets',
+    'boss_bullets',
+    'special_attacks',
+    'powerups',
+)
+
+_NUMERIC_TYPES = (int, float, bool)
+# 参照のまま記録する変更不可の値（状態名の文字列など）
+_IMMUTABLE_TYPES = (str, type(None), tuple, frozenset)
+# 浅いコピーで記録し、巻き戻し時に中身を書き戻すコンテナ（パワーアップの辞書など）
+_CONTAINER_TYPES = (list, dict, set)
+
+
+class _FieldLayout:
+    """1オブジェクト分の記録レイアウト（数値属性名とその型、参照・コピーで記録する属性名）"""
+    def __init__(self, names, kinds, has_rect, ref_names, container_names):
+        self.names = names
+        self.kinds = kinds
+        self.has_rect = has_rect
+        self.ref_names = ref_names
+        self.container_names = container_names
+        self.length = len(names) + (4 if has_rect else 0)
+        if len(names) == 1:
+            getter = attrgetter(names[0])
+            self.getter = lambda obj: (getter(obj),)
+        elif names:
+            self.getter = attrgetter(*names)
+        else:
+            self.getter = lambda obj: ()
+        self.ref_getter = _make_getter(ref_names)
+        self.container_getter = _make_getter(container_names)
+
+
+def _make_getter(names):
+    """属性名のタプルから、値のタプルを返す関数を作成"""
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda obj: (getter(obj),)
+    if names:
+        return attrgetter(*names)
+    return lambda obj: ()
+
+def _restore_container(attrs, name, saved):
+    """コンテナ属性を記録時の中身に戻す（他から参照されている場合があるので中身だけ入れ替える）"""
+    current = attrs.get(name)
+    if type(current) is not type(saved):
+        attrs[name] = type(saved)(saved)
+    elif isinstance(saved, list):
+        current[:] = saved
+    else:
+        current.clear()
+        current.update(saved)
+
+
+class _Frame:
+    """リングバッファ内の1フレーム分の記録"""
+    __slots__ = ('offset', 'length', 'objects', 'layouts', 'lists', 'options', 'boss', 'refs', 'walls')
+
+    def __init__(self, offset, length, objects, layouts, lists, options, boss, refs, walls):
+        self.offset = offset
+        self.length = length
+        self.objects = objects
+        self.layouts = layouts
+        self.lists = lists
+        self.options = options
+        self.boss = boss
+        self.refs = refs
+        self.walls = walls
+
+
+class RewindBuffer:
+    """巻き戻し用のリングバッファ
+
+    オブジェクトグラフはpickleせず、各エンティティの数値属性だけを
+    事前確保したdouble配列に詰めて記録する。オブジェクト自体は参照で保持し、
+    巻き戻し時は数値属性とリストの中身を書き戻す。
+    文字列などの変更不可の値（敵の状態名など）は参照のまま、リスト・辞書・集合の属性
+    （パワーアップ、スペルカードなど）は浅いコピーで記録する。
+    コンテナの要素のうちオブジェクトの中身までは記録しないので、記録対象に含まれない
+    オブジェクト（パーティクル、ダメージ数値など）は巻き戻らない。
+    """
+    def __init__(self, max_frames=REWIND_SECONDS * FPS, memory_budget=REWIND_MEMORY_BUDGET):
+        self.max_frames = max_frames
+        self.memory_budget = memory_budget
+        self.capacity = memory_budget // 8
+        self.values = array('d', bytes(self.capacity * 8))
+        self.frames = deque()
+        self.write_pos = 0
+        self.layouts = {}
+        self.last_capture_ms = 0.0
+        self.dropped_frames = 0
+
+    def clear(self):
+        """記録を全て破棄"""
+        self.frames.clear()
+        self.write_pos = 0
+
+    def _layout_for(self, obj):
+        """オブジェクトの属性構成に対応するレイアウトを取得（構成ごとにキャッシュ）"""
+        attrs = obj.__dict__
+        key = (type(obj), tuple(attrs), tuple(map(type, attrs.values())))
+        layout = self.layouts.get(key)
+        if layout is None:
+            names = tuple(name for name, value in attrs.items()
+                          if type(value) in _NUMERIC_TYPES and name != 'rect')
+            kinds = tuple(type(attrs[name]) for name in names)
+            has_rect = isinstance(attrs.get('rect'), pygame.Rect)
+            # pygameの内部状態（Spriteの所属グループなど）は対象外
+            ref_names = tuple(name for name, value in attrs.items()
+                              if type(value) in _IMMUTABLE_TYPES and not name.startswith('_'))
+            container_names = tuple(name for name, value in attrs.items()
+                                    if type(value) in _CONTAINER_TYPES and not name.startswith('_'))
+            layout = _FieldLayout(names, kinds, has_rect, ref_names, container_names)
+            self.layouts[key] = layout
+        return layout
+
+    def record(self, game):
+        """現在のフレームの状態を記録"""
+        start_time = time.perf_counter()
+
+        player = game.player
+        options = list(player.option_manager.options)
+        boss = game.boss_manager.get_current_boss()
+        lists = tuple(list(getattr(game, name)) for name in REWIND_ENTITY_LISTS)
+
+        objects = [player, game.level_system, player.option_manager, game.boss_manager, game.level_up_upgrade_screen]
+        objects.extend(options)
+        walls = None
+        if boss is not None:
+            objects.append(boss)
+            # 環境操作型ボスの移動壁と重力場
+            if hasattr(boss, 'moving_walls'):
+                walls = boss.moving_walls.sprites()
+                objects.extend(walls)
+                objects.extend(boss.gravity_fields)
+        for entity_list in lists:
+            objects.extend(entity_list)
+
+        game_getter = attrgetter(*REWIND_GAME_FIELDS)
+        flat = list(game_getter(game))
+        layouts = []
+        refs = []
+        for obj in objects:
+            layout = self._layout_for(obj)
+            flat.extend(layout.getter(obj))
+            if layout.has_rect:
+                rect = obj.rect
+                flat.extend((rect.x, rect.y, rect.w, rect.h))
+            if layout.ref_names:
+                refs.extend(layout.ref_getter(obj))
+            if layout.container_names:
+                refs.extend(type(value)(value) for value in layout.container_getter(obj))
+            layouts.append(layout)
+
+        length = len(flat)
+        if length > self.capacity:
+            # 1フレームが予算を超える場合は記録しない
+            self.dropped_frames += 1
+            self.last_capture_ms = (time.perf_counter() - start_time) * 1000
+            return
+
+        offset = self.write_pos
+        if offset + length > self.capacity:
+            # 末尾に収まらないので先頭に戻る（末尾の古いフレームは破棄）
+            while self.frames and self.frames[0].offset >= offset:
+                self.frames.popleft()
+            offset = 0
+        end = offset + length
+        while self.frames:
+            oldest = self.frames[0]
+            if oldest.offset < end and oldest.offset + oldest.length > offset:
+                self.frames.popleft()
+            elif len(self.frames) >= self.max_frames:
+                self.frames.popleft()
+            else:
+                break
+
+        self.values[offset:end] = array('d', flat)
+        self.write_pos = end
+        self.frames.append(_Frame(offset, length, objects, layouts, lists, options, boss, refs, walls))
+        self.last_capture_ms = (time.perf_counter() - start_time) * 1000
+
+    def step_back(self, game):
+        """1フレーム巻き戻す。巻き戻せた場合はTrueを返す"""
+        if len(self.frames) > 1:
+            # 最新フレームは現在の状態なので破棄し、その前のフレームを復元
+            discarded = self.frames.pop()
+            self.write_pos = discarded.offset
+        if not self.frames:
+            return False
+        self._restore(game, self.frames[-1])
+        return True
+
+    def _restore(self, game, frame):
+        values = self.values[frame.offset:frame.offset + frame.length]
+        pos = len(REWIND_GAME_FIELDS)
+        for name, value in zip(REWIND_GAME_FIELDS, values[:pos]):
+            current = getattr(game, name)
+            setattr(game, name, type(current)(value) if isinstance(current, int) and value.is_integer() else value)
+
+        refs = iter(frame.refs)
+        for obj, layout in zip(frame.objects, frame.layouts):
+            attrs = obj.__dict__
+            for name, kind in zip(layout.names, layout.kinds):
+                value = values[pos]
+                pos += 1
+                attrs[name] = value if kind is float else kind(value)
+            if layout.has_rect:
+                obj.rect = pygame.Rect(int(values[pos]), int(values[pos + 1]), int(values[pos + 2]), int(values[pos + 3]))
+                pos += 4
+            for name in layout.ref_names:
+                attrs[name] = next(refs)
+            for name in layout.container_names:
+                _restore_container(attrs, name, next(refs))
+
+        for name, saved in zip(REWIND_ENTITY_LISTS, frame.lists):
+            getattr(game, name)[:] = saved
+        game.player.option_manager.options[:] = frame.options
+        game.boss_manager.current_boss = frame.boss
+        if frame.walls is not None:
+            frame.boss.moving_walls.empty()
+            frame.boss.moving_walls.add(*frame.walls)
+
+    def get_memory_usage(self):
+        """リングバッファの使用量(バイト)を取得"""
+        if not self.frames:
+            return 0
+        used_values = sum(frame.length for frame in self.frames)
+        # 数値配列 + フレームごとのオブジェクト参照
+        used_refs = sum(len(frame.objects) + len(frame.refs) + sum(len(lst) for lst in frame.lists) for frame in self.frames)
+        return used_values * 8 + used_refs * 8
+
+    def get_stats_text(self):
+        """パフォーマンス表示用の文字列を取得"""
+        seconds = len(self.frames) / FPS
+        used_mb = self.get_memory_usage() / (1024 * 1024)
+        budget_mb = self.memory_budget / (1024 * 1024)
+        return f"Rewind: {seconds:.1f}s {used_mb:.2f}/{budget_mb:.0f}MB {self.last_capture_ms:.2f}ms"
@@ -0,0 +1,58 @@
+import math
+
+import pygame
+from settings import *
+
+# (図形の種類と形状パラメータ, 角度ステップ) -> (描画済みSurface, 中心オフセット)
+_rotated_shapes = {}
+
+
+def quantize_angle(angle):
+    """角度(ラジアン)をROTATION_STEPS段階のステップ番号に丸める"""
+    return round(angle * ROTATION_STEPS / (2 * math.pi)) % ROTATION_STEPS
+
+def _step_angle(step):
+    """ステップ番号を角度(ラジアン)に戻す"""
+    return step * 2 * math.pi / ROTATION_STEPS
+
+def get_polygon_sprite(sides, radius, color, angle=0.0, outline_color=None, outline_width=2):
+    """中心から半径radiusの正多角形をangleだけ回転させた画像を取得"""
+    step = quantize_angle(angle)
+    key = ("polygon", sides, radius, color, outline_color, outline_width, step)
+    sprite = _rotated_shapes.get(key)
+    if sprite is None:
+        center = radius + outline_width + 1
+        surface = pygame.Surface((center * 2 + 1, center * 2 + 1), pygame.SRCALPHA)
+        base = _step_angle(step)
+        points = []
+        for i in range(sides):
+            a = base + i * 2 * math.pi / sides
+            points.append((center + math.cos(a) * radius, center + math.sin(a) * radius))
+        pygame.draw.polygon(surface, color, points)
+        if outline_color is not None:
+            pygame.draw.polygon(surface, outline_color, points, outline_width)
+        sprite = (surface, center)
+        _rotated_shapes[key] = sprite
+    return sprite
+
+def get_beam_sprite(length, width, color, angle):
+    """始点からangle方向に伸びる光線（本体＋明るい中心線）の画像を取得（始点が中心）"""
+    step = quantize_angle(angle)
+    key = ("beam", length, width, color, step)
+    sprite = _rotated_shapes.get(key)
+    if sprite is None:
+        center = length + width + 1
+        surface = pygame.Surface((center * 2 + 1, center * 2 + 1), pygame.SRCALPHA)
+        a = _step_angle(step)
+        end = (center + math.cos(a) * length, center + math.sin(a) * length)
+        pygame.draw.line(surface, color, (center, center), end, width)
+        center_color = tuple(min(255, c + 100) for c in color[:3])
+        pygame.draw.line(surface, center_color, (center, center), end, max(1, width // 2))
+        sprite = (surface, center)
+        _rotated_shapes[key] = sprite
+    return sprite
+
+def get_rotation_stats_text():
+    """パフォーマンス表示用の文字列"""
+    memory = sum(s.get_bytesize() * s.get_width() * s.get_height() for s, _ in _rotated_shapes.values())
+    return f"Rotations: {len(_rotated_shapes)} sprites {memory / 1024:.0f}KB"
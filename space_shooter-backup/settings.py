@@ -43,6 +43,7 @@ MASTER_SPARK_DURATION = 300  # 5秒間持続
 MASTER_SPARK_WIDTH = SCREEN_WIDTH // 2  # 画面の半分の幅
 MASTER_SPARK_DAMAGE = 0.5  # フレームごとのダメージ
 MASTER_SPARK_BOSS_DAMAGE_PERCENTAGE = 0.3 # ボスに与える総ダメージ割合
+MASTER_SPARK_HEIGHT_BUCKET = 64  # ビームの事前描画は高さをこの単位で切り上げて作る
 
 # 弾の設定
 BULLET_SPEED = 7
@@ -175,6 +176,10 @@ BOSS_BULLET_SIZE = 8
 BOSS_BULLET_DAMAGE = 1
 BOSS_INVULNERABLE_TIME = 10  # 被弾後の無敵時間（フレーム）
 
+# 環境操作型中ボスの暗転設定
+DARKNESS_ALPHA = 200  # 暗転部分の不透明度
+DARKNESS_SOFT_EDGE = 40  # 明るい円の縁をぼかす幅（ピクセル）
+
 # パワーアップ設定
 POWERUP_SIZE = 25
 POWERUP_SPEED = 3
@@ -256,4 +261,59 @@ SOUND_PATHS = {
     'player_hit': 'assets/sounds/player_hit.wav',
     'bgm': 'assets/sounds/bgm.mp3',
     'masupa': 'assets/sounds/masupa.wav'
-}
\ No newline at end of file
+}
+
+# 巻き戻し設定（BACKSPACE長押しで巻き戻し）
+REWIND_SECONDS = 5  # 巻き戻せる最大秒数
+REWIND_MEMORY_BUDGET = 8 * 1024 * 1024  # リングバッファのメモリ予算（バイト）
+
+# 当たり判定設定
+COLLISION_GRID_CELL_SIZE = ENEMY_SIZE * 2  # 空間ハッシュのセルサイズ（敵サイズ基準）
+COLLISION_BACKEND = "sweep"  # brute / grid / sweep / rectlist（F4で切り替え、件数が多いときはsweepが最速）
+
+# 当たり判定レイヤー（ビットフラグ）
+# 各エンティティはcollision_layer（自分のレイヤー）とcollision_mask（判定する相手のレイヤー）を持つ
+LAYER_PLAYER = 1 << 0
+LAYER_PLAYER_BULLET = 1 << 1
+LAYER_BOMB = 1 << 2
+LAYER_SPECIAL = 1 << 3
+LAYER_ENEMY = 1 << 4
+LAYER_BOSS = 1 << 5
+LAYER_ENEMY_BULLET = 1 << 6
+LAYER_BOSS_BULLET = 1 << 7
+LAYER_WALL = 1 << 8
+LAYER_POWERUP = 1 << 9
+# プレイヤーとの判定をまとめて（numpyがあれば配列演算で）行う危険物のレイヤー
+HAZARD_LAYERS = LAYER_ENEMY_BULLET | LAYER_BOSS_BULLET | LAYER_WALL | LAYER_BOSS
+
+# 連続当たり判定（すり抜け防止）
+CCD_SPEED_THRESHOLD = 6  # この速度(px/フレーム)以上の弾は前フレームからの移動経路で判定
+PIXEL_PERFECT_COLLISION = False  # Trueにするとプレイヤーの弾と画像のある敵は矩形で当たった後にピクセル単位でも判定
+MASK_CACHE_SIZE = 256  # 当たり判定用マスクの最大保持数（種類ごと、超えたら古いものから破棄）
+
+# 被弾フラッシュ設定
+HIT_FLASH_DURATION = 6  # 被弾した敵・ボスを強調表示するフレーム数
+
+# スプライトキャッシュ設定
+SPRITE_CACHE_SIZE = 128  # 拡大縮小・色付け済み画像の最大保持数（超えたら古いものから破棄）
+HIT_FLASH_TINT = (150, 150, 150)  # 被弾フラッシュ時に加算する色
+
+# アセット設定
+# 起動時にワーカースレッドで先読みする画像（assets/img内のファイル名）
+PRELOAD_IMAGES = [
+    "game_back.png", "Image.png",
+    "basic.png", "fast.png", "tank.png", "sniper.png", "shield.png", "kamikaze.png", "barrage.png",
+    "faily.png", "magichuman.png", "dragon.png", "environmental.png",
+]
+
+# 回転キャッシュ設定
+ROTATION_STEPS = 64  # 回転する図形を事前描画する角度の段階数
+
+# 演出キャッシュ設定
+EFFECT_ALPHA_STEP = 8  # 明滅する演出のアルファ値をこの刻みで丸めて事前描画する
+
+# テキストキャッシュ設定
+TEXT_CACHE_SIZE = 256  # 描画済みテキストの最大保持数（超えたら古いものから破棄）
+
+# HUD設定
+HUD_GAUGE_BUCKETS = 100  # 必殺技ゲージはこの段階数ごとに描き直す
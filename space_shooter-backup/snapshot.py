@@ -0,0 +1,209 @@
+import io
+import os
+import pickle
+import random
+import struct
+import time
+import zlib
+import pygame
+from asset_manager import assets
+
+# スナップショットのバイナリ形式
+# ヘッダー: マジック(4バイト) + バージョン(uint16) + ペイロード長(uint32)
+# ペイロード: zlib圧縮したpickle（Game参照・フォント・Surfaceは独自形式で保存）
+# Surfaceはアセットなら(名前, サイズ)、それ以外は最初の1回だけ画素データを保存し、以降は番号で参照する
+SNAPSHOT_MAGIC = b"SSNP"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct("<4sHI")
+
+# スナップショットに含めるGameの属性（シミュレーション状態のみ）
+GAME_STATE_ATTRS = (
+    'player',
+    'bullets',
+    'enemies',
+    'enemy_bullets',
+    'boss_bullets',
+    'special_attacks',
+    'powerups',
+    'particles',
+    'damage_numbers',
+    'score',
+    'lives',
+    'enemy_spawn_timer',
+    'powerup_spawn_timer',
+    'wave_spawn_timer',
+    'wave_spawn_interval',
+    'level_system',
+    'difficulty_manager',
+    'boss_manager',
+    'game_state',
+    'is_paused',
+    'scroll_y',
+    'level_up_notification_timer',
+    'level_transition_timer',
+)
+
+
+def _new_sprite(cls):
+    """グループ所属を持たない状態でSpriteを再生成"""
+    sprite = cls.__new__(cls)
+    pygame.sprite.Sprite.__init__(sprite)
+    return sprite
+
+def _rebuild_group(cls, sprites):
+    """スプライトグループを再構築（所属情報も復元される）"""
+    return cls(*sprites)
+
+
+class _StatePickler(pickle.Pickler):
+    """Game参照・フォント・Surfaceを外部参照として扱うPickler"""
+    def __init__(self, file, game):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.game = game
+        # id(Surface) -> AssetManagerのキー(名前, サイズ)（読み込み時に同じ共有Surfaceを取り直す）
+        self.asset_keys = {id(surface): (name, None) for name, surface in assets.surfaces.items()}
+        self.asset_keys.update((id(surface), key) for key, surface in assets.scaled.items())
+        self.surface_indices = {}  # id(Surface) -> 書き出し済みのSurfaceの番号
+
+    def persistent_id(self, obj):
+        if obj is self.game:
+            return "game"
+        if isinstance(obj, pygame.font.Font):
+            return "small_font" if obj is self.game.small_font else "font"
+        if isinstance(obj, pygame.Surface):
+            asset_key = self.asset_keys.get(id(obj))
+            if asset_key is not None:
+                return ("asset",) + asset_key
+            # 複数のオブジェクトが共有するSurfaceは1回だけ保存する
+            index = self.surface_indices.get(id(obj))
+            if index is not None:
+                return ("surface", index)
+            index = len(self.surface_indices)
+            self.surface_indices[id(obj)] = index
+            return ("surface", index, obj.get_size(), pygame.image.tobytes(obj, "RGBA"))
+        return None
+
+    def reducer_override(self, obj):
+        # 一時的なGroupへの所属（毎フレーム生成されるall_spritesなど）は保存しない
+        if isinstance(obj, pygame.sprite.AbstractGroup):
+            return (_rebuild_group, (type(obj), obj.sprites()))
+        if isinstance(obj, pygame.sprite.Sprite):
+            state = obj.__dict__.copy()
+            state.pop('_Sprite__g', None)
+            return (_new_sprite, (type(obj),), state)
+        return NotImplemented
+
+
+class _StateUnpickler(pickle.Unpickler):
+    """外部参照を現在のGameのオブジェクトに結び付けるUnpickler"""
+    def __init__(self, file, game):
+        super().__init__(file)
+        self.game = game
+        self.surfaces = []  # 復元済みのSurface（保存時の番号順）
+
+    def persistent_load(self, pid):
+        if pid == "game":
+            return self.game
+        if pid == "font":
+            return self.game.font
+        if pid == "small_font":
+            return self.game.small_font
+        if isinstance(pid, tuple) and pid[0] == "asset":
+            _, name, size = pid
+            return assets.get(name, size)
+        if isinstance(pid, tuple) and pid[0] == "surface":
+            if len(pid) == 2:
+                return self.surfaces[pid[1]]
+            _, index, size, data = pid
+            surface = pygame.image.frombytes(data, size, "RGBA").convert_alpha()
+            self.surfaces.append(surface)
+            return surface
+        raise pickle.UnpicklingError(f"未知の外部参照: {pid!r}")
+
+
+def capture_state(game):
+    """Gameの現在のシミュレーション状態を辞書として取得"""
+    state = {attr: getattr(game, attr) for attr in GAME_STATE_ATTRS}
+    state['random_state'] = random.getstate()
+    state['ticks'] = pygame.time.get_ticks()
+    state['screen_size'] = (game.current_width, game.current_height)
+
+    # レベルアップ選択中は選択肢の種類だけを保存（適用関数はラムダのため）
+    upgrade_screen = game.level_up_upgrade_screen
+    if upgrade_screen.is_active:
+        state['level_up_choices'] = [choice.type for choice in upgrade_screen.current_choices]
+    else:
+        state['level_up_choices'] = None
+    return state
+
+def restore_state(game, state):
+    """capture_stateで取得した状態をGameに適用"""
+    if state['screen_size'] != (game.current_width, game.current_height):
+        print(f"警告: スナップショットの画面サイズ {state['screen_size']} と現在の画面サイズが異なります")
+
+    for attr in GAME_STATE_ATTRS:
+        setattr(game, attr, state[attr])
+
+    # 実行環境に依存するパスを現在のものに差し替え
+    game.boss_manager.base_dir = game.base_dir
+    current_boss = game.boss_manager.get_current_boss()
+    if current_boss is not None and hasattr(current_boss, 'base_dir'):
+        current_boss.base_dir = game.base_dir
+
+    # get_ticks()基準のタイマーを現在時刻にずらす
+    tick_offset = pygame.time.get_ticks() - state['ticks']
+    if current_boss is not None and hasattr(current_boss, 'darkness_start_time'):
+        current_boss.darkness_start_time += tick_offset
+        current_boss.darkness_last_end_time += tick_offset
+
+    # レベルアップ選択画面の復元（乱数を消費するので乱数状態の復元より前に行う）
+    upgrade_screen = game.level_up_upgrade_screen
+    upgrade_screen.is_active = False
+    if state['level_up_choices']:
+        upgrade_screen.start_selection(game.player)
+        upgrades_by_type = {upgrade.type: upgrade for upgrade in upgrade_screen.all_upgrades}
+        upgrade_screen.current_choices = [upgrades_by_type[u_type] for u_type in state['level_up_choices']]
+
+    random.setstate(state['random_state'])
+
+def dumps(game):
+    """Gameの状態をバージョン付きバイナリに変換"""
+    buffer = io.BytesIO()
+    _StatePickler(buffer, game).dump(capture_state(game))
+    payload = zlib.compress(buffer.getvalue(), 6)
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(payload)) + payload
+
+def loads(game, blob):
+    """dumpsで作成したバイナリからGameの状態を復元"""
+    if len(blob) < SNAPSHOT_HEADER.size:
+        raise ValueError("スナップショットが短すぎます")
+    magic, version, length = SNAPSHOT_HEADER.unpack_from(blob)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("スナップショット形式ではありません")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"未対応のスナップショットバージョン: {version} (対応: {SNAPSHOT_VERSION})")
+    payload = blob[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + length]
+    if len(payload) != length:
+        raise ValueError("スナップショットが破損しています")
+    state = _StateUnpickler(io.BytesIO(zlib.decompress(payload)), game).load()
+    restore_state(game, state)
+
+def save_snapshot(game, path):
+    """スナップショットをファイルに保存し、サイズ(バイト)を返す"""
+    blob = dumps(game)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(blob)
+    return len(blob)
+
+def load_snapshot(game, path):
+    """ファイルからスナップショットを読み込み、所要時間(ミリ秒)を返す
+
+    pickleを使用しているため、信頼できるファイルのみ読み込むこと
+    """
+    start_time = time.perf_counter()
+    with open(path, 'rb') as f:
+        loads(game, f.read())
+    return (time.perf_counter() - start_time) * 1000
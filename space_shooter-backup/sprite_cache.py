@@ -0,0 +1,65 @@
+from collections import OrderedDict
+
+import pygame
+from settings import *
+
+
+class SpriteCache:
+    """拡大縮小・色付け済みの画像キャッシュ（(元画像, サイズ, 色)ごと、LRUで破棄）"""
+    def __init__(self, max_entries=SPRITE_CACHE_SIZE):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image, size, tint=None):
+        """sizeに拡大縮小し、tintがあれば加算合成した画像を取得"""
+        key = (image, size, tint)
+        sprite = self.entries.get(key)
+        if sprite is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        if image.get_size() == size and tint is None:
+            sprite = image  # そのまま使える場合はコピーしない
+        else:
+            sprite = pygame.transform.scale(image, size)
+            if tint is not None:
+                sprite.fill(tint, special_flags=pygame.BLEND_RGB_ADD)
+        self.entries[key] = sprite
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return sprite
+
+    def prewarm(self, image, size, tints=(None, HIT_FLASH_TINT)):
+        """出現時に通常画像と被弾フラッシュ画像を先に作っておく"""
+        for tint in tints:
+            self.get(image, size, tint)
+
+    def clear(self):
+        """キャッシュを空にする"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_memory_usage(self):
+        """キャッシュしている画像のおおよそのバイト数"""
+        return sum(sprite.get_bytesize() * sprite.get_width() * sprite.get_height()
+                   for sprite in self.entries.values())
+
+    def get_stats_text(self):
+        """パフォーマンス表示用の文字列"""
+        return (f"Sprites: {len(self.entries)}/{self.max_entries} "
+                f"hit {self.hits} miss {self.misses} {self.get_memory_usage() / 1024:.0f}KB")
+
+
+# ゲーム全体で共有するキャッシュ
+sprite_cache = SpriteCache()
+
+def get_scaled_sprite(image, size, tint=None):
+    """共有キャッシュから拡大縮小・色付け済みの画像を取得"""
+    return sprite_cache.get(image, size, tint)
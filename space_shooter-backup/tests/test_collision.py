@@ -0,0 +1,176 @@
+"""当たり判定のブロードフェーズが総当たりと同じ結果を返すかのテスト
+
+使い方: python -m pytest tests
+"""
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import pytest
+from settings import *
+import collision
+from collision import (COLLISION_BACKENDS, SpatialHashGrid, VerticalBandIndex, brute_force_query,
+                       hazard_hits, round_hit)
+
+SEEDS = range(20)
+
+
+def random_rect(rng):
+    """画面外（負の座標）、幅・高さ0、負のサイズ、レーザーのような縦長を混ぜた矩形を生成"""
+    kind = rng.random()
+    x = rng.randint(-200, SCREEN_WIDTH + 200)
+    y = rng.randint(-200, SCREEN_HEIGHT + 200)
+    if kind < 0.1:
+        return pygame.Rect(x, y, rng.choice((0, rng.randint(1, 20))), rng.choice((0, rng.randint(1, 20))))
+    if kind < 0.2:
+        return pygame.Rect(x, y, rng.randint(-40, -1), rng.randint(-40, 40))
+    if kind < 0.3:
+        # レーザー（縦長）
+        return pygame.Rect(x, rng.randint(-SCREEN_HEIGHT, 0), rng.randint(2, 12), rng.randint(SCREEN_HEIGHT, SCREEN_HEIGHT * 2))
+    return pygame.Rect(x, y, rng.randint(1, 80), rng.randint(1, 80))
+
+def make_scene(seed, count=200, queries=200):
+    """登録する矩形と問い合わせる矩形を生成"""
+    rng = random.Random(seed)
+    return [random_rect(rng) for _ in range(count)], [random_rect(rng) for _ in range(queries)]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_spatial_hash_grid_matches_brute_force(seed):
+    rects, queries = make_scene(seed)
+    grid = SpatialHashGrid()
+    grid.build(rects)
+    for rect in queries:
+        assert grid.query(rect) == brute_force_query(rects, rect), rect
+
+@pytest.mark.parametrize("cell_size", [1, 7, 64, 1000])
+def test_spatial_hash_grid_cell_sizes(cell_size):
+    rects, queries = make_scene(cell_size)
+    grid = SpatialHashGrid(cell_size)
+    grid.build(rects)
+    for rect in queries:
+        assert grid.query(rect) == brute_force_query(rects, rect), rect
+
+@pytest.mark.parametrize("name", COLLISION_BACKENDS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_backend_matches_brute_force(name, seed):
+    rects, queries = make_scene(seed)
+    broadphase = COLLISION_BACKENDS[name]()
+    broadphase.build(rects)
+    for rect in queries:
+        assert broadphase.query(rect) == brute_force_query(rects, rect), rect
+
+@pytest.mark.parametrize("name", COLLISION_BACKENDS)
+def test_empty_backend(name):
+    broadphase = COLLISION_BACKENDS[name]()
+    broadphase.build([])
+    assert broadphase.query(pygame.Rect(0, 0, 10, 10)) == []
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_hazard_hits_matches_scalar(seed, use_numpy, monkeypatch):
+    if use_numpy and not collision.NUMPY_AVAILABLE:
+        pytest.skip("numpyがありません")
+    monkeypatch.setattr(collision, "NUMPY_AVAILABLE", use_numpy)
+    rng = random.Random(seed)
+    rects, queries = make_scene(seed)
+    round_flags = [rng.random() < 0.5 for _ in rects]
+    for target in queries[:20]:
+        expected = [round_hit(target, rect) if round_shape else target.colliderect(rect)
+                    for rect, round_shape in zip(rects, round_flags)]
+        assert hazard_hits(target, rects, round_flags) == expected, target
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_vertical_band_index_matches_brute_force(seed):
+    rects, queries = make_scene(seed)
+    index = VerticalBandIndex()
+    index.build(rects)
+    for rect in queries:
+        assert index.query(rect) == brute_force_query(rects, rect), rect
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_vertical_band_index_points(seed):
+    rng = random.Random(seed)
+    points = [(rng.randint(-50, SCREEN_WIDTH + 50), rng.randint(-50, SCREEN_HEIGHT + 50)) for _ in range(300)]
+    # 同じx座標の点も混ぜる
+    points.extend((points[i][0], rng.randint(0, SCREEN_HEIGHT)) for i in range(20))
+    rects = [random_rect(rng) for _ in range(50)]
+    index = VerticalBandIndex()
+    index.build(rects)
+    index.build_points(points)
+    for _ in range(100):
+        x0 = rng.randint(-60, SCREEN_WIDTH)
+        x1 = x0 + rng.randint(0, 100)
+        y0 = rng.randint(-SCREEN_HEIGHT, SCREEN_HEIGHT)
+        y1 = y0 + rng.randint(0, SCREEN_HEIGHT)
+        expected = [i for i, (x, y) in enumerate(points) if x0 <= x <= x1 and y0 <= y <= y1]
+        assert index.query_points(x0, x1, y0, y1) == expected
+    # 点の登録は矩形の登録を壊さない
+    for rect in rects:
+        assert index.query(rect) == brute_force_query(rects, rect)
+
+
+class PlayerProbe:
+    """プレイヤーの当たり判定の属性だけを持つ問い合わせ用オブジェクト"""
+    collision_layer = LAYER_PLAYER
+    collision_mask = LAYER_ENEMY_BULLET | LAYER_BOSS_BULLET | LAYER_WALL
+    swept_collision = False
+    band_query = False
+    mask_collision = False
+
+    def __init__(self, rect):
+        self.rect = rect
+        self.x, self.y = rect.center
+        self.prev_x, self.prev_y = self.x, self.y
+
+def make_hazards(seed, center):
+    """プレイヤーの周りにボスの弾（ボスの攻撃パターンと同じ速さ）・敵の弾・壁を配置"""
+    from bullet import Bullet
+    from boss.boss_bullet import BossBullet
+    from boss.moving_wall import MovingWall
+    rng = random.Random(seed)
+    boss_bullets = []
+    for _ in range(150):
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(2, 5)
+        bullet = BossBullet(center[0] + rng.randint(-80, 80), center[1] + rng.randint(-80, 80),
+                            math.cos(angle) * speed, math.sin(angle) * speed, size=rng.choice((6, 8, 12)))
+        bullet.update()
+        boss_bullets.append(bullet)
+    enemy_bullets = []
+    for _ in range(30):
+        bullet = Bullet(center[0] + rng.randint(-60, 60), center[1] + rng.randint(-60, 60), direction_y=1)
+        bullet.update()
+        enemy_bullets.append(bullet)
+    walls = []
+    for _ in range(4):
+        wall = MovingWall()
+        wall.rect.center = (center[0] + rng.randint(-40, 40), center[1] + rng.randint(-100, 100))
+        walls.append(wall)
+    return boss_bullets, enemy_bullets, walls
+
+@pytest.mark.parametrize("seed", range(5))
+def test_player_hazards_take_vectorized_pass(seed, monkeypatch):
+    if not collision.NUMPY_AVAILABLE:
+        pytest.skip("numpyがありません")
+    player = PlayerProbe(pygame.Rect(380, 480, 40, 40))
+    boss_bullets, enemy_bullets, walls = make_hazards(seed, player.rect.center)
+    targets = boss_bullets + enemy_bullets + walls
+
+    batch_sizes = []
+    def recording_hazard_hits(target, rects, round_flags):
+        batch_sizes.append(len(rects))
+        return hazard_hits(target, rects, round_flags)
+    monkeypatch.setattr(collision, "hazard_hits", recording_hazard_hits)
+    contacts = collision.CollisionWorld().collect_contacts([player], targets)
+
+    # ボスの弾と壁はすべて1回のまとめた判定に入り、速い敵の弾（連続判定）は入らない
+    assert batch_sizes == [len(boss_bullets) + len(walls)]
+    assert contacts.get((LAYER_PLAYER, LAYER_BOSS_BULLET))
+
+    monkeypatch.setattr(collision, "NUMPY_AVAILABLE", False)
+    assert collision.CollisionWorld().collect_contacts([player], targets) == contacts
@@ -0,0 +1,30 @@
+"""ダメージ数値の表記のテスト
+
+使い方: python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pytest
+from damage_number import format_damage
+
+
+@pytest.mark.parametrize("damage, text", [
+    (1, "1"),
+    (0.5, "0.5"),
+    (7.25, "7.2"),
+    (9.94, "9.9"),
+    (9.96, "10"),
+    (9.999, "10"),
+    (10.4, "10"),
+    (999, "999"),
+    (999.6, "1K"),
+    (1234.5, "1.2K"),
+    (999999, "1M"),
+    (2500000, "2.5M"),
+    (-12.6, "-13"),
+])
+def test_format_damage(damage, text):
+    assert format_damage(damage) == text
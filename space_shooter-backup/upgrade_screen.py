@@ -3,13 +3,14 @@ import json
 import os
 import settings # settingsモジュールをインポート
 from utils import draw_text # draw_textをインポート
+from font_registry import fonts
 
 class UpgradeScreen:
     def __init__(self, screen, font_path):
         self.screen = screen
         self.font_path = font_path
-        self.font = pygame.font.Font(font_path, 30)
-        self.small_font = pygame.font.Font(font_path, 20)
+        self.font = fonts.get(font_path, 30)
+        self.small_font = fonts.get(font_path, 20)
         self.running = True
         self.upgrade_data = self.load_upgrade_data()
         
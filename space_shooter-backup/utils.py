@@ -2,32 +2,53 @@ import pygame
 import random
 import math
 import os
+from collections import OrderedDict
 from settings import *
+from asset_manager import assets
+from font_registry import get_font
+from overlay_cache import draw_overlay
+
+# テキスト描画結果のキャッシュ（(フォント, 文字列, 色, アンチエイリアス) -> Surface）
+_text_cache = OrderedDict()
+_text_cache_stats = {"hits": 0, "misses": 0}
 
 
 def init_font():
     """メインフォントの初期化"""
-    font_path = os.path.join(os.path.dirname(__file__), "NotoSansJP-VariableFont_wght.ttf")
-    try:
-        return pygame.font.Font(font_path, 36)
-    except Exception as e:
-        print(f"Error loading font {font_path}: {e}")
-        # フォントの初期化に失敗した場合はエラーを発生させる
-        raise
+    return get_font(36)
 
 def init_small_font():
     """小さいフォントの初期化"""
-    font_path = os.path.join(os.path.dirname(__file__), "NotoSansJP-VariableFont_wght.ttf")
-    try:
-        return pygame.font.Font(font_path, 20)
-    except Exception as e:
-        print(f"Error loading font {font_path}: {e}")
-        # フォントの初期化に失敗した場合はエラーを発生させる
-        raise
+    return get_font(20)
+
+def render_text(font, text, color, antialias=True):
+    """font.renderの結果をLRUキャッシュから取得（返したSurfaceは共有なので書き換えない）"""
+    key = (font, text, tuple(color), antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        _text_cache_stats["hits"] += 1
+        return surface
+
+    _text_cache_stats["misses"] += 1
+    surface = font.render(text, antialias, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+def get_text_cache_stats():
+    """テキストキャッシュのヒット数・ミス数・件数"""
+    return {"hits": _text_cache_stats["hits"], "misses": _text_cache_stats["misses"], "entries": len(_text_cache)}
+
+def get_text_cache_stats_text():
+    """パフォーマンス表示用の文字列"""
+    stats = get_text_cache_stats()
+    return f"Text cache: {stats['entries']}/{TEXT_CACHE_SIZE} hit {stats['hits']} miss {stats['misses']}"
 
 def draw_text_absolute(screen, text, x, y, font, color=WHITE, anchor="center"):
     """絶対座標でテキストを描画"""
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(font, text, color)
     text_rect = text_surface.get_rect()
     
     if anchor == "topleft":
@@ -73,7 +94,7 @@ def draw_text_multiline(screen, text, font, color, rect, start_x, start_y):
         space = font.size(' ')[0]  # 幅 of a space.
         x = start_x
         for word in words:
-            word_surface = font.render(word, True, color)
+            word_surface = render_text(font, word, color)
             word_width, word_height = word_surface.get_size()
             if x + word_width >= rect.right:
                 x = start_x  # Reset the x.
@@ -90,17 +111,14 @@ def draw_score(screen, score, font):
 def draw_lives(screen, lives, font):
     """残機を描画（アイコン＋数字）"""
     # 残機アイコンとしてプレイヤー画像を小さく表示
-    import os
-    img_path = os.path.join(os.path.dirname(__file__), 'assets', 'img', 'Image.png')
     try:
-        icon = pygame.image.load(img_path).convert_alpha()
         icon_size = 24
-        icon = pygame.transform.scale(icon, (icon_size, icon_size))
+        icon = assets.get('Image.png', (icon_size, icon_size))
         for i in range(min(lives, 5)):
             screen.blit(icon, (20 + i * (icon_size + 6), 20))
         # 6機以上は「×n」表記
         if lives > 5:
-            text = font.render(f"×{lives}", True, WHITE)
+            text = render_text(font, f"×{lives}", WHITE)
             screen.blit(text, (20 + 5 * (icon_size + 6), 20))
     except Exception:
         # 画像がない場合はテキストのみ
@@ -197,15 +215,6 @@ def check_laser_collision(laser, enemy):
         return False
     return laser.rect.colliderect(enemy.rect)
 
-def check_bomb_explosion_collision(bomb, enemy):
-    """爆弾の爆発範囲と敵の当たり判定"""
-    if not bomb.exploded or bomb.explosion_radius <= 0:
-        return False
-    
-    # 円形の当たり判定
-    distance = math.sqrt((enemy.x - bomb.x) ** 2 + (enemy.y - bomb.y) ** 2)
-    return distance <= bomb.explosion_radius
-
 # パーティクル関連の関数
 def create_explosion_effect():
     """爆発エフェクトのパーティクルを生成"""
@@ -296,7 +305,7 @@ def draw_particles(screen, particles):
         alpha = max(0, min(255, alpha))
         
         # パーティクルのサイズを計算
-        size = max(1, int(4 * (particle['life'] / particle['max_life'])))
+        size = max(1, int(particle.get('size', 4) * (particle['life'] / particle['max_life'])))
         
         # 色にアルファ値を適用（簡易版）
         color = particle['color']
@@ -327,39 +336,36 @@ def draw_title_screen(screen, font, small_font):
 
 def draw_game_over_screen(screen, score, font):
     """ゲームオーバー画面を描画"""
-    # 半透明の黒いオーバーレイ
-    overlay = pygame.Surface(screen.get_size())
-    overlay.set_alpha(128)
-    overlay.fill(BLACK)
-    screen.blit(overlay, (0, 0))
-    
-    draw_text_relative(screen, "GAME OVER", 0.5, 0.4, font, RED)
+    def draw_static(overlay):
+        draw_text_relative(overlay, "GAME OVER", 0.5, 0.4, font, RED)
+        draw_text_relative(overlay, "Press R to Retry", 0.5, 0.6, font, WHITE)
+        draw_text_relative(overlay, "Press Q to Quit", 0.5, 0.65, font, WHITE)
+
+    # 半透明の黒いオーバーレイと固定の文字は解像度ごとに一度だけ作る
+    draw_overlay(screen, "game_over", 128, draw_static, font)
+    # スコアだけは変わったときにテキストキャッシュで描き直される
     draw_text_relative(screen, f"Final Score: {score}", 0.5, 0.5, font, WHITE)
-    draw_text_relative(screen, "Press R to Retry", 0.5, 0.6, font, WHITE)
-    draw_text_relative(screen, "Press Q to Quit", 0.5, 0.65, font, WHITE)
 
 def draw_pause_screen(screen, font):
     """ポーズ画面を描画"""
-    # 半透明の黒いオーバーレイ
-    overlay = pygame.Surface(screen.get_size())
-    overlay.set_alpha(128)
-    overlay.fill(BLACK)
-    screen.blit(overlay, (0, 0))
-    
-    # 一時停止タイトル
-    draw_text_relative(screen, "一時停止", 0.5, 0.25, font, WHITE)
-    
-    # 操作方法の説明
-    draw_text_relative(screen, "P or ESCで再開", 0.5, 0.35, font, WHITE)
-    
-    # 一時停止中の操作説明
-    draw_text_relative(screen, "P or ESC: 一時停止", 0.5, 0.45, font, GRAY)
-    draw_text_relative(screen, "Q: タイトルに戻る", 0.5, 0.55, font, GRAY)
-    
-    # ゲーム中の操作説明
-    draw_text_relative(screen, "SPACE: ショット", 0.5, 0.65, font, GRAY)
-    draw_text_relative(screen, "B: 必殺技発動", 0.5, 0.75, font, GRAY)
-    draw_text_relative(screen, " M: ミュージック切り替え", 0.5, 0.85, font, GRAY)
+    def draw_static(overlay):
+        # 一時停止タイトル
+        draw_text_relative(overlay, "一時停止", 0.5, 0.25, font, WHITE)
+
+        # 操作方法の説明
+        draw_text_relative(overlay, "P or ESCで再開", 0.5, 0.35, font, WHITE)
+
+        # 一時停止中の操作説明
+        draw_text_relative(overlay, "P or ESC: 一時停止", 0.5, 0.45, font, GRAY)
+        draw_text_relative(overlay, "Q: タイトルに戻る", 0.5, 0.55, font, GRAY)
+
+        # ゲーム中の操作説明
+        draw_text_relative(overlay, "SPACE: ショット", 0.5, 0.65, font, GRAY)
+        draw_text_relative(overlay, "B: 必殺技発動", 0.5, 0.75, font, GRAY)
+        draw_text_relative(overlay, " M: ミュージック切り替え", 0.5, 0.85, font, GRAY)
+
+    # 半透明の黒いオーバーレイに文字を描き込んだものを解像度ごとに一度だけ作る
+    draw_overlay(screen, "pause", 128, draw_static, font)
 
 def draw_sound_status(screen, sound_manager, small_font):
     """サウンド状態を表示"""
@@ -381,71 +387,6 @@ def draw_weapon_status(screen, player, small_font):
     draw_text_relative(screen, f"武器: {current_weapon}", 0.95, 0.9, small_font, weapon_color, anchor="bottomright")
 
 
-def draw_special_gauge(screen, player, font):
-    """必殺技ゲージを描画（画面比率対応版）"""
-    # 画面サイズに応じてゲージの位置とサイズを調整
-    screen_width, screen_height = screen.get_size()
-    
-    # ゲージのサイズと位置を画面比率に応じて調整
-    gauge_width = int(screen_width * 0.15)  # 画面幅の15%
-    gauge_height = int(screen_height * 0.03)  # 画面高さの3%
-    x = int(screen_width * 0.05)  # 画面左端から5%
-    y = int(screen_height * 0.85)  # 画面下端から15%
-    
-    # ゲージの背景
-    bg_rect = pygame.Rect(x, y, gauge_width, gauge_height)
-    pygame.draw.rect(screen, GRAY, bg_rect)
-    
-    # ゲージの充填部分
-    fill_width = (player.special_gauge / player.max_special_gauge) * gauge_width
-    fill_rect = pygame.Rect(x, y, fill_width, gauge_height)
-    
-    # ゲージの色を決定
-    if player.special_gauge >= player.max_special_gauge:
-        gauge_color = YELLOW  # 満タン
-    else:
-        gauge_color = BLUE
-        
-    pygame.draw.rect(screen, gauge_color, fill_rect)
-    
-    # ゲージの枠線
-    pygame.draw.rect(screen, WHITE, bg_rect, 2)
-    
-    # テキスト（フォントサイズも画面比率に応じて調整）
-    text_size = max(16, int(screen_height * 0.02))  # 最小16px、画面高さの2%
-    try:
-        text_font = pygame.font.Font(None, text_size)
-    except:
-        text_font = font  # フォールバック
-    
-    text_surf = text_font.render("SP", True, WHITE)
-    text_rect = text_surf.get_rect()
-    text_rect.midleft = (x + 10, y + gauge_height // 2)
-    screen.blit(text_surf, text_rect)
-
-def draw_adaptive_text(screen, text, x_percent, y_percent, base_font, color=WHITE, anchor="center", min_size=16):
-    """画面比率に応じてフォントサイズを調整してテキストを描画"""
-    screen_width, screen_height = screen.get_size()
-    
-    # 画面サイズに応じてフォントサイズを調整
-    base_size = base_font.get_height()
-    scale_factor = min(screen_width / 800, screen_height / 600)  # 800x600を基準とする
-    new_size = max(min_size, int(base_size * scale_factor))
-    
-    try:
-        # 新しいサイズでフォントを作成
-        adaptive_font = pygame.font.Font(base_font.get_filename(), new_size)
-    except:
-        # フォールバック: 既存のフォントを使用
-        adaptive_font = base_font
-    
-    # 相対座標を絶対座標に変換
-    x_abs = int(screen_width * x_percent)
-    y_abs = int(screen_height * y_percent)
-    
-    # テキストを描画
-    draw_text_absolute(screen, text, x_abs, y_abs, adaptive_font, color, anchor)
-
 def create_adaptive_button(screen, text, x_percent, y_percent, width_percent, height_percent, font, color=DARK_GRAY, text_color=WHITE):
     """画面比率に応じてボタンのサイズと位置を調整"""
     screen_width, screen_height = screen.get_size()
@@ -524,7 +465,7 @@ def draw_fps_counter(screen, fps, font, position="topright", bg_alpha=180):
             anchor = "topright"
         
         # テキストを描画
-        text_surface = font.render(fps_text, True, fps_color)
+        text_surface = render_text(font, fps_text, fps_color)
         text_rect = text_surface.get_rect()
         
         # アンカーに応じて位置を設定